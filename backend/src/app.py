@@ -6,6 +6,7 @@ All data is persisted in PostgreSQL before creating Stripe checkout sessions.
 Only IDs are stored in Stripe metadata for webhook processing.
 """
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -44,8 +45,12 @@ from .routes.telemetry import router as telemetry_router
 from .routes.tickets import router as tickets_router
 from .routes.photos import router as photos_router
 from .routes.webhooks import router as webhooks_router
+from .routes.webhooks import close_redis_client as close_webhook_redis_client
+from .routes.webhooks import drain_fulfillment_tasks, run_fulfillment_sweeper
 from .routes.fleets import router as fleets_router
 from .services.database import get_db_service
+from .services.statement import close_http_client as close_statement_http_client
+from .services.statement import watch_memory_pressure
 
 # Set up structured logging
 use_json_logging = os.getenv("JSON_LOGGING", "true").lower() == "true"
@@ -112,11 +117,23 @@ async def lifespan(app: FastAPI):
     # Initialize shared HTTP client
     app.state.client = httpx.AsyncClient(timeout=10.0)
 
+    # Flush DeepSeek caches if the worker runs low on memory
+    memory_watcher = asyncio.create_task(watch_memory_pressure())
+
+    # Re-mail paid appeals whose background fulfillment never finished
+    fulfillment_sweeper = asyncio.create_task(run_fulfillment_sweeper())
+
     yield
 
     # Shutdown - graceful cleanup
     logger.info("Shutting down Fight City Tickets API")
+    memory_watcher.cancel()
+    fulfillment_sweeper.cancel()
+    # Let queued Lob mailings finish before their clients are closed
+    await drain_fulfillment_tasks()
     await app.state.client.aclose()
+    await close_statement_http_client()
+    await close_webhook_redis_client()
     try:
         # Close database connections gracefully
         db_service = get_db_service()
@@ -4,12 +4,19 @@ Structured JSON Logging Configuration for Fight City Tickets
 Provides JSON-formatted logs for better parsing and integration with log aggregation services.
 """
 
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+# Background thread that drains queued log records to the real handlers
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
 
 class JSONFormatter(logging.Formatter):
     """Custom formatter that outputs JSON-structured log entries."""
@@ -49,6 +56,23 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_data, default=str)
 
 
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+
+    The stock QueueHandler formats the record on the calling thread and
+    drops exc_info; here only the message arguments are merged (so later
+    mutation can't change the text) and the JSON formatting, exception
+    rendering and stream I/O all happen off the request path.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 def setup_logging(
     level: str = "INFO",
     use_json: bool = True,
@@ -62,11 +86,16 @@ def setup_logging(
         use_json: Whether to use JSON formatting (default: True for production)
         log_file: Optional file path for file logging
     """
+    global _queue_listener
+
     log_level = getattr(logging, level.upper(), logging.INFO)
 
     # Clear existing handlers
     root_logger = logging.getLogger()
     root_logger.handlers = []
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
 
     # Create formatter
     if use_json:
@@ -81,14 +110,23 @@ def setup_logging(
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
     console_handler.setLevel(log_level)
-    root_logger.addHandler(console_handler)
+    handlers: list[logging.Handler] = [console_handler]
 
     # File handler (if specified)
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
         file_handler.setLevel(log_level)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Callers only enqueue records; a listener thread formats and writes
+    # them, so request handlers never block on the stdout lock or disk
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(_DeferredQueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
 
     # Set root logger level
     root_logger.setLevel(log_level)
@@ -98,3 +136,13 @@ def setup_logging(
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("asyncio").setLevel(logging.WARNING)
 
+
+def stop_logging() -> None:
+    """Flush queued log records and stop the listener thread."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(stop_logging)
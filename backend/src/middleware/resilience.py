@@ -123,6 +123,19 @@ class CircuitBreaker:
                 logger.warning(reason)
                 raise CircuitOpenError(reason)
     
+    def is_open(self) -> bool:
+        """
+        Check whether calls would currently be rejected.
+
+        Cheap, lock-free check for callers that want to fail fast before
+        doing any work. Returns False once the cooldown has elapsed so the
+        next call can probe the service in HALF_OPEN state.
+        """
+        return (
+            self.metrics.state == CircuitState.OPEN
+            and not self._should_attempt_reset()
+        )
+
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset."""
         if self.metrics.last_failure_time is None:
@@ -5,9 +5,9 @@ Provides information about supported cities and eligibility.
 """
 
 import logging
-from typing import List, Dict, Any
 
 from fastapi import APIRouter, Query, Request
+from fastapi.responses import ORJSONResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
@@ -32,7 +32,7 @@ def get_registry() -> CityRegistry:
     return _city_registry
 
 
-@router.get("/")
+@router.get("/", response_class=ORJSONResponse)
 @limiter.limit("60/minute")
 async def get_cities(
     request: Request,
@@ -40,7 +40,7 @@ async def get_cities(
         True,
         description="Filter only eligible cities (no POA required, no corporate block)",
     ),
-) -> List[Dict[str, Any]]:
+) -> ORJSONResponse:
     """
     Get list of supported cities.
 
@@ -52,7 +52,8 @@ async def get_cities(
     try:
         registry = get_registry()
         cities = registry.get_all_cities(eligible_only=eligible)
-        return cities
+        # Plain dicts go straight to orjson, skipping FastAPI's encoder pass
+        return ORJSONResponse(cities)
     except Exception as e:
         logger.error(f"Error retrieving cities: {e}")
         raise
@@ -8,7 +8,7 @@ import logging
 import hashlib
 from datetime import datetime
 from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 
 from ..services.ocr_telemetry import get_ocr_telemetry_service, OcrTelemetryRecord
 
@@ -98,6 +98,29 @@ async def submit_ocr_telemetry(request: Request, data: OcrTelemetryRequest):
         )
 
 
+@router.get("/ocr/stats")
+async def get_ocr_stats_bulk(
+    city_id: list[str] = Query(..., description="City identifiers (repeatable)"),
+):
+    """
+    Get OCR accuracy statistics for several cities at once.
+
+    Answers all requested cities from a single grouped query, e.g.
+    ``/ocr/stats?city_id=sf&city_id=la``.
+    """
+    try:
+        telemetry_service = get_ocr_telemetry_service()
+        stats = telemetry_service.get_city_ocr_stats_bulk(city_id)
+        return {"statistics": stats}
+
+    except Exception as e:
+        logger.error(f"Failed to get OCR stats: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve stats: {str(e)}",
+        )
+
+
 @router.get("/ocr/stats/{city_id}")
 async def get_ocr_stats(city_id: str):
     """
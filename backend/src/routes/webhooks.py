@@ -6,11 +6,15 @@ Uses database for persistent storage and implements idempotent processing.
 Includes in-memory idempotency cache to prevent duplicate processing.
 """
 
+import asyncio
+import inspect
 import logging
+import os
 import time
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -36,6 +40,116 @@ _WEBHOOK_CACHE: dict[str, dict] = {}
 _WEBHOOK_CACHE_TTL = 86400  # 24 hours
 _WEBHOOK_CACHE_MAX_SIZE = 10000  # Max events to cache
 
+# Optional Redis fast path for duplicate deliveries (SET NX across workers)
+REDIS_URL = os.getenv("REDIS_URL", "")
+_WEBHOOK_CLAIM_TTL = 600  # seconds a claim blocks redeliveries while processing
+_redis_client = None
+
+# Background mail fulfillments: strong task references and in-flight sessions
+_FULFILLMENT_TASKS: set[asyncio.Task] = set()
+_FULFILLMENTS_IN_PROGRESS: set[str] = set()
+_FULFILLMENT_CLAIM_TTL = 900  # seconds one worker owns a mailing
+_FULFILLMENT_DRAIN_TIMEOUT = 25.0  # shutdown wait for in-flight mailings
+_FULFILLMENT_SWEEP_INTERVAL = 300  # seconds between pending-fulfillment sweeps
+_FULFILLMENT_RETRY_GRACE = 600  # paid this long ago and still unmailed = orphaned
+
+
+def _get_redis_client():
+    """Get the shared async Redis client if Redis is configured and installed."""
+    global _redis_client
+    if _redis_client is None and REDIS_URL:
+        try:
+            import redis.asyncio as redis
+            _redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+        except ImportError:
+            pass
+    return _redis_client
+
+
+async def close_redis_client() -> None:
+    """Close the shared Redis client (called on app shutdown)."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+async def _claim_event(event_id: str) -> Optional[bool]:
+    """
+    Atomically claim an event for processing with Redis SET NX.
+
+    Returns:
+        True if this delivery owns the event, False if another delivery
+        already claimed it, None if Redis is unavailable
+    """
+    redis_client = _get_redis_client()
+    if redis_client is None:
+        return None
+    try:
+        return bool(
+            await redis_client.set(
+                f"stripe:webhook:{event_id}", "1", nx=True, ex=_WEBHOOK_CLAIM_TTL
+            )
+        )
+    except Exception as e:
+        logger.warning("Redis webhook claim failed: %s", e)
+        return None
+
+
+async def _release_event(event_id: str) -> None:
+    """Drop a claim so a redelivery of an unfinished event is processed again."""
+    redis_client = _get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(f"stripe:webhook:{event_id}")
+    except Exception as e:
+        logger.warning("Redis webhook release failed: %s", e)
+
+
+async def _claim_fulfillment(session_id: str) -> bool:
+    """
+    Claim the mailing for a session so only one task sends the letter.
+
+    The in-process set guards this worker; with Redis configured the claim
+    also holds across workers.
+
+    Returns:
+        True if the caller owns the mailing and must release it
+    """
+    if session_id in _FULFILLMENTS_IN_PROGRESS:
+        return False
+    _FULFILLMENTS_IN_PROGRESS.add(session_id)
+
+    redis_client = _get_redis_client()
+    if redis_client is not None:
+        try:
+            claimed = await redis_client.set(
+                f"stripe:fulfillment:{session_id}",
+                "1",
+                nx=True,
+                ex=_FULFILLMENT_CLAIM_TTL,
+            )
+        except Exception as e:
+            logger.warning("Redis fulfillment claim failed: %s", e)
+            claimed = True
+        if not claimed:
+            _FULFILLMENTS_IN_PROGRESS.discard(session_id)
+            return False
+    return True
+
+
+async def _release_fulfillment(session_id: str) -> None:
+    """Release a mailing claim taken by _claim_fulfillment."""
+    _FULFILLMENTS_IN_PROGRESS.discard(session_id)
+    redis_client = _get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(f"stripe:fulfillment:{session_id}")
+    except Exception as e:
+        logger.warning("Redis fulfillment release failed: %s", e)
+
 
 def _generate_event_id(event_type: str, object_id: str) -> str:
     """Generate a unique event ID for idempotency tracking."""
@@ -153,7 +267,200 @@ def _cleanup_expired_entries() -> int:
     return len(expired_keys)
 
 
-async def handle_checkout_session_completed(session: dict[str, Any]) -> dict[str, Any]:
+async def _send_and_fulfill(
+    db_service: Any,
+    session_id: str,
+    payment: Any,
+    intake: Any,
+    mail_request: AppealLetterRequest,
+    now: datetime,
+) -> dict[str, Any]:
+    """
+    Mail a paid appeal via Lob and record the fulfillment.
+
+    Runs as a background task from the webhook so Lob latency stays off the
+    response path; the admin retry endpoint awaits it directly.
+
+    Returns:
+        Outcome dictionary with success, message and fulfillment_result
+    """
+    outcome: dict[str, Any] = {
+        "success": False,
+        "message": "",
+        "fulfillment_result": None,
+    }
+
+    try:
+        # Send appeal via mail service
+        mail_service = get_mail_service()
+        mail_result = await mail_service.send_appeal_letter(mail_request)
+
+        # Update payment with fulfillment result
+        if mail_result.success:
+            tracking_id = (
+                mail_result.tracking_number
+                or f"LOB_{now.strftime('%Y%m%d_%H%M%S')}_{payment.id}"
+            )
+            mail_type = (
+                "certified"
+                if payment.appeal_type == AppealType.CERTIFIED
+                else "standard"
+            )
+
+            # Only a still-paid payment is marked fulfilled (not a refunded one)
+            fulfillment_result = db_service.advance_payment_state(
+                session_id,
+                PaymentStatus.PAID,
+                from_state=PaymentStatus.PAID,
+                is_fulfilled=True,
+                fulfillment_date=datetime.now(timezone.utc),
+                lob_tracking_id=tracking_id,
+                lob_mail_type=mail_type,
+            )
+
+            if fulfillment_result:
+                outcome["success"] = True
+                outcome["message"] = "Payment processed and appeal sent successfully"
+                outcome["fulfillment_result"] = {
+                    "success": True,
+                    "tracking_number": mail_result.tracking_number,
+                    "letter_id": mail_result.letter_id,
+                    "expected_delivery": mail_result.expected_delivery,
+                }
+
+                logger.info(
+                    "Successfully fulfilled appeal for payment %s, citation %s, tracking: %s",
+                    payment.id,
+                    intake.citation_number,
+                    mail_result.tracking_number,
+                )
+
+                # Send email notifications
+                email_service = get_email_service()
+                if intake.user_email:
+                    await email_service.send_payment_confirmation(
+                        email=intake.user_email,
+                        citation_number=intake.citation_number,
+                        amount_paid=payment.amount_total,
+                        appeal_type=str(payment.appeal_type),
+                        session_id=session_id,
+                    )
+
+                    await email_service.send_appeal_mailed(
+                        email=intake.user_email,
+                        citation_number=intake.citation_number,
+                        tracking_number=mail_result.tracking_number or "",
+                        expected_delivery=mail_result.expected_delivery,
+                    )
+            else:
+                outcome["message"] = (
+                    "Payment marked as paid but failed to mark as fulfilled"
+                )
+                logger.error("Failed to mark payment %s as fulfilled", payment.id)
+        else:
+            error_msg = mail_result.error_message or "Unknown mail error"
+            outcome["message"] = f"Payment processed but mail failed: {error_msg}"
+            logger.error(
+                "Mail service failed for payment %s, citation %s: %s",
+                payment.id,
+                intake.citation_number,
+                error_msg,
+            )
+
+            # Payment stays PAID and unfulfilled, which is the state the
+            # retry endpoint picks up; no extra write is needed here.
+            # Alert admin via Sentry (already configured in app.py)
+            # The /admin/retry endpoint can be used to retry failed mailings
+            # DO NOT suspend the droplet - that would take the entire service offline
+    except Exception as e:
+        logger.exception(
+            "Error fulfilling appeal for session %s: %s", session_id, e
+        )
+        outcome["message"] = f"Error fulfilling appeal: {type(e).__name__}: {e}"
+
+    return outcome
+
+
+async def _fulfill_claimed(
+    db_service: Any,
+    session_id: str,
+    payment: Any,
+    intake: Any,
+    mail_request: AppealLetterRequest,
+    now: datetime,
+    event_id: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Run _send_and_fulfill for a claimed session, releasing the claim after.
+
+    When event_id is given (background webhook mailings) the event is
+    recorded here, once the mailing outcome is known.
+    """
+    try:
+        outcome = await _send_and_fulfill(
+            db_service, session_id, payment, intake, mail_request, now
+        )
+        if event_id is not None:
+            _mark_event_processed(
+                event_id,
+                "checkout.session.completed",
+                {"message": outcome["message"]},
+            )
+        return outcome
+    finally:
+        await _release_fulfillment(session_id)
+
+
+def _build_mail_request(
+    payment: Any, intake: Any, draft: Any, metadata: Optional[dict]
+) -> AppealLetterRequest:
+    """Build the Lob mail request for a paid intake."""
+    city_id: str | None = None
+    section_id: str | None = None
+
+    if metadata:
+        city_id = metadata.get("city_id") or metadata.get("cityId")
+        section_id = metadata.get("section_id") or metadata.get("sectionId")
+
+    # Fallback: re-validate citation
+    if not city_id:
+        try:
+            from ..services.citation import CitationValidator
+
+            # Class-level call reuses the shared default validator
+            validation = CitationValidator.validate_citation(intake.citation_number)
+            if validation and validation.city_id:
+                city_id = validation.city_id
+                section_id = validation.section_id
+                logger.info(
+                    "Re-validated citation %s: city_id=%s, section_id=%s",
+                    intake.citation_number,
+                    city_id,
+                    section_id,
+                )
+        except Exception as e:
+            logger.warning("Could not re-validate citation: %s", e)
+
+    return AppealLetterRequest(
+        citation_number=intake.citation_number,
+        appeal_type=payment.appeal_type.value
+        if hasattr(payment.appeal_type, "value")
+        else str(payment.appeal_type),
+        user_name=intake.user_name,
+        user_address=intake.user_address_line1,
+        user_city=intake.user_city,
+        user_state=intake.user_state,
+        user_zip=intake.user_zip,
+        letter_text=draft.draft_text,
+        signature_data=intake.signature_data,
+        city_id=city_id,
+        section_id=section_id,
+    )
+
+
+async def handle_checkout_session_completed(
+    session: dict[str, Any], background: bool = True
+) -> dict[str, Any]:
     """
     Handle checkout.session.completed webhook event.
 
@@ -161,12 +468,27 @@ async def handle_checkout_session_completed(session: dict[str, Any]) -> dict[str
 
     Args:
         session: Stripe session object
+        background: Mail the appeal in a background task (webhooks) rather
+            than awaiting it (admin retries)
 
     Returns:
         Processing result dictionary
     """
-    session_id = session.get("id") or ""
+    # Only process paid sessions; unpaid/pending deliveries never touch
+    # metadata or storage
     payment_status = session.get("payment_status")
+    if payment_status != "paid":
+        return {
+            "event_type": "checkout.session.completed",
+            "processed": False,
+            "message": f"Payment not completed: {payment_status}",
+            "payment_id": None,
+            "intake_id": None,
+            "draft_id": None,
+            "fulfillment_result": None,
+        }
+
+    session_id = session.get("id") or ""
     metadata = session.get("metadata", {})
 
     result: dict[str, Any] = {
@@ -179,11 +501,6 @@ async def handle_checkout_session_completed(session: dict[str, Any]) -> dict[str
         "fulfillment_result": None,
     }
 
-    # Only process paid sessions
-    if payment_status != "paid":
-        result["message"] = f"Payment not completed: {payment_status}"
-        return result
-
     # Validate session_id
     if not session_id:
         result["message"] = "No session ID provided"
@@ -191,7 +508,17 @@ async def handle_checkout_session_completed(session: dict[str, Any]) -> dict[str
 
     # Idempotency check - check database first to avoid race conditions
     event_id = _generate_event_id("checkout.session.completed", session_id)
-    
+
+    # Duplicate deliveries claimed elsewhere skip the database entirely.
+    # Admin retries (background=False) deliberately bypass the claim. A
+    # claim expires after _WEBHOOK_CLAIM_TTL; after that the database
+    # record is what keeps redeliveries idempotent.
+    claimed = await _claim_event(event_id) if background else None
+    if claimed is False:
+        result["processed"] = True
+        result["message"] = "Duplicate delivery (idempotent)"
+        return result
+
     try:
         db_service = get_db_service()
         payment = db_service.get_payment_by_session(session_id)
@@ -214,11 +541,22 @@ async def handle_checkout_session_completed(session: dict[str, Any]) -> dict[str
                 _mark_event_processed(event_id, "checkout.session.completed", result)
                 return result
         
-        # Check cache only after database check to avoid race conditions
-        is_processed, cached_result = _is_event_processed(event_id)
-        if is_processed and cached_result:
-            logger.info("Returning cached result for event %s", event_id)
-            return cached_result
+        # A redelivery while the letter is still being mailed must not send twice
+        if session_id in _FULFILLMENTS_IN_PROGRESS:
+            result["processed"] = True
+            result["message"] = "Fulfillment already in progress (idempotent)"
+            if claimed:
+                await _release_event(event_id)
+            return result
+
+        # Check cache only after database check to avoid race conditions.
+        # Admin retries skip it: they exist to redo an event whose mailing
+        # failed after it was recorded.
+        if background:
+            is_processed, cached_result = _is_event_processed(event_id)
+            if is_processed and cached_result:
+                logger.info("Returning cached result for event %s", event_id)
+                return cached_result
 
         if not payment:
             payment_id = metadata.get("payment_id")
@@ -230,9 +568,9 @@ async def handle_checkout_session_completed(session: dict[str, Any]) -> dict[str
 
         # Update payment status to PAID
         now = datetime.now(timezone.utc)
-        updated_payment = db_service.update_payment_status(
-            stripe_session_id=session_id,
-            status=PaymentStatus.PAID,
+        updated = db_service.advance_payment_state(
+            session_id,
+            PaymentStatus.PAID,
             stripe_payment_intent=session.get("payment_intent") or "",
             stripe_customer_id=session.get("customer") or "",
             receipt_url=session.get("receipt_url") or "",
@@ -240,143 +578,67 @@ async def handle_checkout_session_completed(session: dict[str, Any]) -> dict[str
             stripe_metadata=metadata,
         )
 
-        if not updated_payment:
+        if not updated:
             result["message"] = "Failed to update payment status"
+            if claimed:
+                await _release_event(event_id)
             return result
 
         # Get intake and draft for fulfillment
         intake = db_service.get_intake(payment.intake_id)
         if not intake:
             result["message"] = f"Intake {payment.intake_id} not found"
+            if claimed:
+                await _release_event(event_id)
             return result
 
         draft = db_service.get_latest_draft(payment.intake_id)
         if not draft:
             result["message"] = f"Draft for intake {payment.intake_id} not found"
+            if claimed:
+                await _release_event(event_id)
             return result
 
-        # Extract city_id from metadata
-        city_id: str | None = None
-        section_id: str | None = None
-
-        if metadata:
-            city_id = metadata.get("city_id") or metadata.get("cityId")
-            section_id = metadata.get("section_id") or metadata.get("sectionId")
-
-        # Fallback: re-validate citation
-        if not city_id:
-            try:
-                from ..services.citation import CitationValidator
-
-                validator = CitationValidator()
-                validation = validator.validate_citation(intake.citation_number)
-                if validation and validation.city_id:
-                    city_id = validation.city_id
-                    section_id = validation.section_id
-                    logger.info(
-                        "Re-validated citation %s: city_id=%s, section_id=%s",
-                        intake.citation_number,
-                        city_id,
-                        section_id,
-                    )
-            except Exception as e:
-                logger.warning("Could not re-validate citation: %s", e)
-
-        # Prepare mail request
-        mail_request = AppealLetterRequest(
-            citation_number=intake.citation_number,
-            appeal_type=payment.appeal_type.value
-            if hasattr(payment.appeal_type, "value")
-            else str(payment.appeal_type),
-            user_name=intake.user_name,
-            user_address=intake.user_address_line1,
-            user_city=intake.user_city,
-            user_state=intake.user_state,
-            user_zip=intake.user_zip,
-            letter_text=draft.draft_text,
-            signature_data=intake.signature_data,
-            city_id=city_id,
-            section_id=section_id,
-        )
-
-        # Send appeal via mail service
-        mail_service = get_mail_service()
-        mail_result = await mail_service.send_appeal_letter(mail_request)
-
-        # Update payment with fulfillment result
-        if mail_result.success:
-            tracking_id = (
-                mail_result.tracking_number
-                or f"LOB_{now.strftime('%Y%m%d_%H%M%S')}_{payment.id}"
-            )
-            mail_type = (
-                "certified"
-                if payment.appeal_type == AppealType.CERTIFIED
-                else "standard"
-            )
-
-            fulfillment_result = db_service.mark_payment_fulfilled(
-                stripe_session_id=session_id,
-                lob_tracking_id=tracking_id,
-                lob_mail_type=mail_type,
-            )
-
-            if fulfillment_result:
-                result["processed"] = True
-                result["message"] = "Payment processed and appeal sent successfully"
-                result["fulfillment_result"] = {
-                    "success": True,
-                    "tracking_number": mail_result.tracking_number,
-                    "letter_id": mail_result.letter_id,
-                    "expected_delivery": mail_result.expected_delivery,
-                }
-
-                logger.info(
-                    "Successfully fulfilled appeal for payment %s, citation %s, tracking: %s",
-                    payment.id,
-                    intake.citation_number,
-                    mail_result.tracking_number,
-                )
+        mail_request = _build_mail_request(payment, intake, draft, metadata)
 
-                # Send email notifications
-                email_service = get_email_service()
-                if intake.user_email:
-                    await email_service.send_payment_confirmation(
-                        email=intake.user_email,
-                        citation_number=intake.citation_number,
-                        amount_paid=payment.amount_total,
-                        appeal_type=str(payment.appeal_type),
-                        session_id=session_id,
-                    )
+        # One mailing per session, across redeliveries, retries and workers
+        if not await _claim_fulfillment(session_id):
+            result["processed"] = True
+            result["message"] = "Fulfillment already in progress (idempotent)"
+            if claimed:
+                await _release_event(event_id)
+            return result
 
-                    await email_service.send_appeal_mailed(
-                        email=intake.user_email,
-                        citation_number=intake.citation_number,
-                        tracking_number=mail_result.tracking_number or "",
-                        expected_delivery=mail_result.expected_delivery,
-                    )
-            else:
-                result["message"] = (
-                    "Payment marked as paid but failed to mark as fulfilled"
+        if background:
+            # Mail the appeal off the webhook response path; Stripe only
+            # needs the acknowledgement, not Lob's round trip. The payment
+            # stays PAID and unfulfilled until mailed, which is what
+            # retry_pending_fulfillments picks up if this task never finishes.
+            # The task records the event itself: caching "queued" here would
+            # shadow a failed mailing from later retries.
+            task = asyncio.create_task(
+                _fulfill_claimed(
+                    db_service,
+                    session_id,
+                    payment,
+                    intake,
+                    mail_request,
+                    now,
+                    event_id=event_id,
                 )
-                logger.error("Failed to mark payment %s as fulfilled", payment.id)
+            )
+            _FULFILLMENT_TASKS.add(task)
+            task.add_done_callback(_FULFILLMENT_TASKS.discard)
+            result["processed"] = True
+            result["message"] = "Payment processed; appeal mailing queued"
+            return result
         else:
-            error_msg = mail_result.error_message or "Unknown mail error"
-            result["message"] = f"Payment processed but mail failed: {error_msg}"
-            logger.error(
-                "Mail service failed for payment %s, citation %s: %s",
-                payment.id,
-                intake.citation_number,
-                error_msg,
+            fulfillment = await _fulfill_claimed(
+                db_service, session_id, payment, intake, mail_request, now
             )
-
-            # Mark payment as failed_fulfillment for retry
-            payment.status = "failed_fulfillment"
-            db_service.db.commit()
-            
-            # Alert admin via Sentry (already configured in app.py)
-            # The /admin/retry endpoint can be used to retry failed mailings
-            # DO NOT suspend the droplet - that would take the entire service offline
+            result["processed"] = fulfillment["success"]
+            result["message"] = fulfillment["message"]
+            result["fulfillment_result"] = fulfillment["fulfillment_result"]
 
     except ValueError as e:
         # Specific error for missing data
@@ -404,7 +666,113 @@ async def handle_checkout_session_completed(session: dict[str, Any]) -> dict[str
     return result
 
 
-async def handle_payment_intent_succeeded(
+async def retry_pending_fulfillments(
+    grace_seconds: float = _FULFILLMENT_RETRY_GRACE,
+) -> int:
+    """
+    Mail paid appeals whose fulfillment never completed.
+
+    A payment that is PAID but not fulfilled long after it was paid had its
+    mailing lost (restart mid-send, Lob failure). Each one is claimed first
+    so a mailing still running elsewhere is left alone.
+
+    Args:
+        grace_seconds: Minimum age since payment before a retry is attempted
+
+    Returns:
+        Number of payments fulfilled
+    """
+    db_service = get_db_service()
+    cutoff = datetime.now(timezone.utc).timestamp() - grace_seconds
+    fulfilled = 0
+
+    for payment in db_service.get_pending_payments():
+        paid_at = payment.paid_at or payment.created_at
+        if paid_at is not None:
+            if paid_at.tzinfo is None:
+                paid_at = paid_at.replace(tzinfo=timezone.utc)
+            if paid_at.timestamp() > cutoff:
+                continue
+
+        session_id = payment.stripe_session_id
+        if not await _claim_fulfillment(session_id):
+            continue
+
+        intake = db_service.get_intake(payment.intake_id)
+        draft = db_service.get_latest_draft(payment.intake_id) if intake else None
+        if not intake or not draft:
+            logger.error(
+                "Cannot retry fulfillment for session %s: intake or draft missing",
+                session_id,
+            )
+            await _release_fulfillment(session_id)
+            continue
+
+        mail_request = _build_mail_request(
+            payment, intake, draft, payment.stripe_metadata
+        )
+        outcome = await _fulfill_claimed(
+            db_service,
+            session_id,
+            payment,
+            intake,
+            mail_request,
+            datetime.now(timezone.utc),
+        )
+        if outcome["success"]:
+            fulfilled += 1
+        else:
+            logger.error(
+                "Retry fulfillment failed for session %s: %s",
+                session_id,
+                outcome["message"],
+            )
+
+    return fulfilled
+
+
+async def run_fulfillment_sweeper(
+    interval: float = _FULFILLMENT_SWEEP_INTERVAL,
+) -> None:
+    """
+    Periodically retry orphaned fulfillments (started from the app lifespan).
+
+    Needs Redis: without a shared claim, sweepers in several workers could
+    mail the same appeal twice.
+    """
+    if _get_redis_client() is None:
+        logger.warning(
+            "REDIS_URL not configured; unfulfilled payments must be retried "
+            "via /webhook/retry"
+        )
+        return
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            fulfilled = await retry_pending_fulfillments()
+            if fulfilled:
+                logger.info("Fulfillment sweep mailed %d pending appeals", fulfilled)
+        except Exception:
+            logger.exception("Fulfillment sweep failed")
+
+
+async def drain_fulfillment_tasks(
+    timeout: float = _FULFILLMENT_DRAIN_TIMEOUT,
+) -> None:
+    """Wait for in-flight background mailings before the worker exits."""
+    if not _FULFILLMENT_TASKS:
+        return
+    _, pending = await asyncio.wait(set(_FULFILLMENT_TASKS), timeout=timeout)
+    if pending:
+        logger.warning(
+            "%d appeal mailings still running at shutdown; "
+            "the fulfillment sweep will retry them",
+            len(pending),
+        )
+
+
+def handle_payment_intent_succeeded(
     payment_intent: dict[str, Any],
 ) -> dict[str, Any]:
     """Handle payment_intent.succeeded event."""
@@ -416,7 +784,7 @@ async def handle_payment_intent_succeeded(
     }
 
 
-async def handle_payment_intent_failed(
+def handle_payment_intent_failed(
     payment_intent: dict[str, Any],
 ) -> dict[str, Any]:
     """Handle payment_intent.failed event."""
@@ -429,6 +797,14 @@ async def handle_payment_intent_failed(
     }
 
 
+# Stripe event type -> handler, built once at import
+_EVENT_HANDLERS = {
+    "checkout.session.completed": handle_checkout_session_completed,
+    "payment_intent.succeeded": handle_payment_intent_succeeded,
+    "payment_intent.payment_failed": handle_payment_intent_failed,
+}
+
+
 @router.post("")
 async def handle_stripe_webhook(request: Request) -> dict[str, Any]:
     """
@@ -449,19 +825,17 @@ async def handle_stripe_webhook(request: Request) -> dict[str, Any]:
         raise HTTPException(status_code=400, detail="Invalid signature")
 
     try:
-        event_data = await request.json()
+        # Signature is verified against the raw body; parse it exactly once
+        event_data = orjson.loads(body)
         event_type = event_data.get("type")
         event_payload = event_data.get("data", {}).get("object", {})
 
-        handlers = {
-            "checkout.session.completed": handle_checkout_session_completed,
-            "payment_intent.succeeded": handle_payment_intent_succeeded,
-            "payment_intent.payment_failed": handle_payment_intent_failed,
-        }
-
-        handler = handlers.get(event_type)
+        handler = _EVENT_HANDLERS.get(event_type)
         if handler:
-            result = await handler(event_payload)
+            result = handler(event_payload)
+            # Only handlers that do I/O are coroutines
+            if inspect.isawaitable(result):
+                result = await result
             return result
         else:
             logger.info("Unhandled event type: %s", event_type)
@@ -508,7 +882,7 @@ async def retry_fulfillment(
             return {"success": False, "message": "Session not found in Stripe"}
 
         # Re-process
-        result = await handle_checkout_session_completed(session)
+        result = await handle_checkout_session_completed(session, background=False)
 
         return {
             "success": result.get("processed", False),
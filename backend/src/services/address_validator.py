@@ -16,6 +16,7 @@ import json
 import logging
 import re
 from dataclasses import dataclass
+from operator import attrgetter
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple, Union
@@ -77,6 +78,39 @@ EXPECTED_ADDRESSES: Dict[str, str] = {
     "us-wa-seattle": "Seattle Municipal Court, PO Box 34987, Seattle, WA 98124-4987",
 }
 
+# Address normalization patterns, compiled once (input is lowercased first)
+_PO_BOX_RE = re.compile(r"\bp\.o\.\s*box\b|\bp\.o\s*box\b|\bpo\s*box\b")
+_ABBREVIATIONS: Dict[str, str] = {
+    "street": "st",
+    "avenue": "ave",
+    "drive": "dr",
+    "road": "rd",
+    "lane": "ln",
+    "boulevard": "blvd",
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+    "floor": "fl",
+    "attention": "attn",
+}
+_PUNCT_TABLE = str.maketrans("", "", ".,;:")
+
+# Reads the AppealMailAddress fields joined (in order) into the stored address string
+_get_stored_address_fields = attrgetter(
+    "department", "attention", "address1", "address2", "city", "state", "zip"
+)
+
+# Address component patterns for _parse_address_string
+_ATTN_RE = re.compile(r"attn[:\s]+([^,]+)", re.IGNORECASE)
+_STATE_ZIP_RE = re.compile(r",\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)", re.IGNORECASE)
+_PARSE_PO_BOX_RE = re.compile(r"(po\s*box\s*\d+[^,]*|p\.o\.\s*box\s*\d+[^,]*)", re.IGNORECASE)
+_STREET_RE = re.compile(
+    r"(\d+\s+[^,]+(?:street|st|avenue|ave|drive|dr|road|rd|boulevard|blvd|parkway|pkwy)[^,]*)",
+    re.IGNORECASE,
+)
+_FLOOR_RE = re.compile(r"(\d+(?:st|nd|rd|th)\s+floor|floor\s+\d+)", re.IGNORECASE)
+
 
 @dataclass
 class AddressValidationResult:
@@ -111,6 +145,9 @@ class AddressValidator:
         # Cache key is based on (city_id + current date) to limit scraping to once per day per address
         self._scrape_cache: Dict[str, Tuple[str, date]] = {}
 
+        # Stored address strings: {(city_id, section_id): (mail_address, string)}
+        self._stored_address_cache: Dict[Tuple[str, Optional[str]], Tuple[Any, Optional[str]]] = {}
+
 
     def _get_cache_key(self, city_id: str) -> str:
         """
@@ -169,37 +206,13 @@ class AddressValidator:
         if not address:
             return ""
 
-        # Convert to lowercase
-        normalized = address.lower().strip()
-
-        # Normalize common abbreviations
-        replacements = {
-            r'\bp\.o\.\s*box\b': 'po box',
-            r'\bp\.o\s*box\b': 'po box',
-            r'\bpo\s*box\b': 'po box',
-            r'\bstreet\b': 'st',
-            r'\bavenue\b': 'ave',
-            r'\bdrive\b': 'dr',
-            r'\broad\b': 'rd',
-            r'\blane\b': 'ln',
-            r'\bboulevard\b': 'blvd',
-            r'\bnorth\b': 'n',
-            r'\bsouth\b': 's',
-            r'\beast\b': 'e',
-            r'\bwest\b': 'w',
-            r'\bfloor\b': 'fl',
-            r'\battn\b': 'attn',
-            r'\battention\b': 'attn',
-        }
-
-        for pattern, replacement in replacements.items():
-            normalized = re.sub(pattern, replacement, normalized, flags=re.IGNORECASE)
-
-        # Remove extra whitespace and punctuation variations
-        normalized = re.sub(r'\s+', ' ', normalized)
-        normalized = re.sub(r'[.,;:]', '', normalized)
+        # Lowercase and unify PO Box spellings while the dots are still there
+        normalized = _PO_BOX_RE.sub("po box", address.lower())
 
-        return normalized.strip()
+        # Drop punctuation, then abbreviate whole words with one dict lookup
+        # per token (splitting also collapses whitespace)
+        tokens = normalized.translate(_PUNCT_TABLE).split()
+        return " ".join([_ABBREVIATIONS.get(token, token) for token in tokens])
 
     async def _extract_address_from_text(self, text: str, city_id: str) -> Optional[str]:
         """
@@ -373,24 +386,20 @@ Return ONLY the mailing address as it appears on the page, or "NOT_FOUND" if no
         if not mail_address or mail_address.status.value != "complete":
             return None
 
-        # Build address string
-        parts = []
-        if mail_address.department:
-            parts.append(mail_address.department)
-        if mail_address.attention:
-            parts.append("ATTN: {mail_address.attention}")
-        if mail_address.address1:
-            parts.append(mail_address.address1)
-        if mail_address.address2:
-            parts.append(mail_address.address2)
-        if mail_address.city:
-            parts.append(mail_address.city)
-        if mail_address.state:
-            parts.append(mail_address.state)
-        if mail_address.zip:
-            parts.append(mail_address.zip)
-
-        return ", ".join(parts) if parts else None
+        # Reuse the string built for this exact address object; a registry
+        # reload yields new objects, so stale entries are never returned
+        key = (city_id, section_id)
+        cached = self._stored_address_cache.get(key)
+        if cached is not None and cached[0] is mail_address:
+            return cached[1]
+
+        # Build address string from the non-empty fields, in order
+        department, attention, *rest = _get_stored_address_fields(mail_address)
+        if attention:
+            attention = f"ATTN: {attention}"
+        address_string = ", ".join(filter(None, (department, attention, *rest))) or None
+        self._stored_address_cache[key] = (mail_address, address_string)
+        return address_string
 
     def _addresses_match(self, stored: str, scraped: str) -> bool:
         """
@@ -529,12 +538,12 @@ Return ONLY the mailing address as it appears on the page, or "NOT_FOUND" if no
         }
 
         # Extract ATTN/Attention
-        attn_match = re.search(r'attn[:\s]+([^,]+)', address, re.IGNORECASE)
+        attn_match = _ATTN_RE.search(address)
         if attn_match:
             parts["attention"] = attn_match.group(1).strip()
 
         # Extract state and ZIP (format: "City, ST ZIP")
-        state_zip_match = re.search(r',\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)', address, re.IGNORECASE)
+        state_zip_match = _STATE_ZIP_RE.search(address)
         if state_zip_match:
             parts["state"] = state_zip_match.group(1).upper()
             parts["zip"] = state_zip_match.group(2)
@@ -546,12 +555,12 @@ Return ONLY the mailing address as it appears on the page, or "NOT_FOUND" if no
                 parts["city"] = city_match.group(1).strip()
 
         # Extract PO Box or street address
-        po_box_match = re.search(r'(po\s*box\s*\d+[^,]*|p\.o\.\s*box\s*\d+[^,]*)', address, re.IGNORECASE)
+        po_box_match = _PARSE_PO_BOX_RE.search(address)
         if po_box_match:
             parts["address1"] = po_box_match.group(0).strip()
         else:
             # Try to extract street address (number + street name)
-            street_match = re.search(r'(\d+\s+[^,]+(?:street|st|avenue|ave|drive|dr|road|rd|boulevard|blvd|parkway|pkwy)[^,]*)', address, re.IGNORECASE)
+            street_match = _STREET_RE.search(address)
             if street_match:
                 parts["address1"] = street_match.group(0).strip()
 
@@ -561,12 +570,12 @@ Return ONLY the mailing address as it appears on the page, or "NOT_FOUND" if no
             if dept_end > 0:
                 dept_part = address[:dept_end].strip()
                 # Remove ATTN if present
-                dept_part = re.sub(r'attn[:\s]+[^,]+', '', dept_part, flags=re.IGNORECASE).strip()
+                dept_part = _ATTN_RE.sub('', dept_part).strip()
                 if dept_part:
                     parts["department"] = dept_part.rstrip(',').strip()
 
         # Extract address2 (floor, suite, etc.)
-        floor_match = re.search(r'(\d+(?:st|nd|rd|th)\s+floor|floor\s+\d+)', address, re.IGNORECASE)
+        floor_match = _FLOOR_RE.search(address)
         if floor_match:
             parts["address2"] = floor_match.group(0).strip()
 
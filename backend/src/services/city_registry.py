@@ -40,7 +40,6 @@ TODO: API - Add is_eligible_for_appeals(city_id) method. Right now callers check
       TIER 3 city (Chicago, D.C.) can never accidentally be routed to the appeal flow.
 """
 
-import json
 import logging
 import re
 import time
@@ -49,6 +48,8 @@ from enum import Enum
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
+import orjson
+
 # Set up logger
 logger = logging.getLogger(__name__)
 
@@ -106,7 +107,7 @@ class Jurisdiction(str, Enum):
     DISTRICT = "district"
 
 
-@dataclass
+@dataclass(slots=True)
 class SpecialRequirements:
     """Special requirements and restrictions for a city/section."""
 
@@ -133,7 +134,7 @@ class SpecialRequirements:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class AppealMailAddress:
     """Complete mailing address for appeal submissions."""
 
@@ -221,7 +222,7 @@ class AppealMailAddress:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class PhoneConfirmationPolicy:
     """Phone confirmation policy for a city."""
 
@@ -266,7 +267,7 @@ class PhoneConfirmationPolicy:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class CitationPattern:
     """Citation pattern with regex matching."""
 
@@ -299,7 +300,7 @@ class CitationPattern:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class CitySection:
     """Section within a city (e.g., SFMTA, SFPD)."""
 
@@ -328,7 +329,7 @@ class CitySection:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationMetadata:
     """Verification metadata for city configuration."""
 
@@ -354,7 +355,7 @@ class VerificationMetadata:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class CityConfiguration:
     """Complete city configuration for Schema 4.3.0."""
 
@@ -372,12 +373,17 @@ class CityConfiguration:
     appeal_deadline_days: int = 21
     online_appeal_available: bool = False
     online_appeal_url: Optional[str] = None
+    # Set by the first is_eligible read (a slot, so no cached_property)
+    _is_eligible: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def is_eligible(self) -> bool:
         """
         Check if city is eligible for our service.
 
+        Computed on first access and then stored on the instance;
+        configurations are not modified after loading.
+
         Eligibility Rules:
         1. Must NOT require wet-ink signatures (digital signatures accepted preferred, or we handle it)
         2. Must NOT require Power of Attorney (POA)
@@ -385,6 +391,12 @@ class CityConfiguration:
 
         A city is eligible if at least one section is eligible.
         """
+        if self._is_eligible is None:
+            self._is_eligible = self._any_section_eligible()
+        return self._is_eligible
+
+    def _any_section_eligible(self) -> bool:
+        """Scan sections for one without blocking requirements."""
         for section in self.sections.values():
             if not section.special_requirements:
                 # If no special requirements specified, assume eligible (default)
@@ -447,6 +459,17 @@ class CityRegistry:
         self._citation_cache: Dict[
             str, Tuple[str, str]
         ] = {}  # citation -> (city_id, section_id)
+        # get_all_cities() lists keyed by eligible_only, built from the
+        # city_configs mapping recorded in _city_list_source
+        self._city_list_cache: Dict[bool, List[Dict[str, Any]]] = {}
+        self._city_list_source: Optional[Dict[str, CityConfiguration]] = None
+
+    def register_city(self, city_id: str, config: CityConfiguration) -> None:
+        """Add or replace a city configuration and index its citation patterns."""
+        self.city_configs[city_id] = config
+        self._build_citation_cache_for_city(city_id, config)
+        # City lists handed out before this change are out of date
+        self._city_list_cache.clear()
 
     def load_cities(self) -> None:
         """Load all city configurations from JSON files."""
@@ -489,8 +512,7 @@ class CityRegistry:
                 # Check if file is already in Schema 4.3.0 format (us- prefix)
                 is_schema_43 = json_file.name.startswith("us-")
 
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = orjson.loads(json_file.read_bytes())
 
                 # Get city_id from data (not filename)
                 city_id = data.get("city_id", json_file.stem)
@@ -558,8 +580,7 @@ class CityRegistry:
                     errors += 1
                     continue
 
-                self.city_configs[city_id] = config
-                self._build_citation_cache_for_city(city_id, config)
+                self.register_city(city_id, config)
                 loaded_city_ids.add(city_id)
                 loaded += 1
                 logger.info(f"Loaded city configuration: {city_id}")
@@ -568,14 +589,16 @@ class CityRegistry:
                 logger.error(f"Failed to load {json_file}: {e}")
                 errors += 1
 
+        # Covers loads that register nothing, e.g. every file failing
+        self._city_list_cache.clear()
+
         logger.info(
             "Loaded {loaded} city configurations, {errors} errors, {skipped} skipped"
         )
 
     def _load_city_config(self, json_file: Path) -> CityConfiguration:
         """Load a single city configuration from JSON file."""
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(json_file.read_bytes())
         return self._load_city_config_from_data(data, json_file)
 
     def _load_city_config_from_data(
@@ -933,7 +956,19 @@ class CityRegistry:
         Args:
             eligible_only: If True, return only cities eligible for service (status check + rules).
             eligibility_filter: Optional status(es) to filter by.
+
+        Unfiltered results are cached until a city is registered or
+        city_configs is replaced; each caller gets its own copy of the list.
+        The city dicts inside are shared and must not be mutated.
         """
+        if eligibility_filter is None:
+            if self._city_list_source is not self.city_configs:
+                self._city_list_cache.clear()
+                self._city_list_source = self.city_configs
+            cached = self._city_list_cache.get(eligible_only)
+            if cached is not None:
+                return list(cached)
+
         cities = []
 
         # Prepare filter set if provided
@@ -964,6 +999,10 @@ class CityRegistry:
                     "is_eligible": config.is_eligible,
                 }
             )
+
+        if eligibility_filter is None:
+            self._city_list_cache[eligible_only] = cities
+            return list(cities)
         return cities
 
     def validate_phone_for_city(
@@ -1055,8 +1094,7 @@ if __name__ == "__main__":
     )
 
     # Manually add for testing
-    registry.city_configs["s"] = sf_config
-    registry._build_citation_cache_for_city("s", sf_config)
+    registry.register_city("s", sf_config)
 
     # Test matching
     match = registry.match_citation("912345678")
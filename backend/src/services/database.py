@@ -11,7 +11,7 @@ import time
 from contextlib import contextmanager
 from typing import Any, Generator, Optional
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -439,41 +439,42 @@ class DatabaseService:
 
             return None
 
-    def mark_payment_fulfilled(
-        self, stripe_session_id: str, lob_tracking_id: str, lob_mail_type: str
-    ) -> Optional[Payment]:
+    def advance_payment_state(
+        self,
+        stripe_session_id: str,
+        to_state: PaymentStatus,
+        from_state: Optional[PaymentStatus] = None,
+        **kwargs,
+    ) -> bool:
         """
-        Mark payment as fulfilled with Lob tracking info.
+        Move a payment to a new status in a single UPDATE statement.
+
+        Unlike update_payment_status this does not load the row first. When
+        from_state is given the update is a compare-and-set: it only applies
+        if the payment is currently in that state.
 
         Args:
             stripe_session_id: Stripe session ID
-            lob_tracking_id: Lob tracking ID
-            lob_mail_type: Lob mail type
+            to_state: New payment status
+            from_state: Required current status, or None to update unconditionally
+            **kwargs: Additional columns to set in the same write
 
         Returns:
-            Updated Payment object or None if not found
+            True if the payment was updated
         """
-        from datetime import datetime, timezone
-
-        with self.get_session() as session:
-            payment = (
-                session.query(Payment)
-                .filter(Payment.stripe_session_id == stripe_session_id)
-                .first()
-            )
+        values = {key: value for key, value in kwargs.items() if hasattr(Payment, key)}
+        values["status"] = to_state
 
-            if payment:
-                payment.is_fulfilled = True
-                payment.fulfillment_date = datetime.now(timezone.utc)
-                payment.lob_tracking_id = lob_tracking_id
-                payment.lob_mail_type = lob_mail_type
+        stmt = update(Payment).where(Payment.stripe_session_id == stripe_session_id)
+        if from_state is not None:
+            stmt = stmt.where(Payment.status == from_state)
 
-                logger.info(
-                    f"Marked payment {payment.id} as fulfilled (Lob: {lob_tracking_id})"
-                )
-                return payment
+        with self.get_session() as session:
+            updated = session.execute(stmt.values(**values)).rowcount == 1
 
-            return None
+        if updated:
+            logger.info(f"Advanced payment {stripe_session_id} to {to_state}")
+        return updated
 
     def get_pending_payments(self, limit: int = 100) -> list[Payment]:
         """
@@ -295,7 +295,7 @@ class LobMailService:
                 logger.warning("Lob library not installed, using fallback")
                 self._use_lob = False
             except Exception as e:
-                logger.error(f"Failed to initialize Lob client: {e}")
+                logger.error("Failed to initialize Lob client: %s", e)
                 self._use_lob = False
         else:
             logger.warning("LobMailService initialized but no API key configured")
@@ -505,7 +505,7 @@ class LobMailService:
             return self.AGENCY_ADDRESSES[agency_key]
 
         # Fallback to generic address
-        logger.warning(f"Unknown agency key: {agency_key}, using generic address")
+        logger.warning("Unknown agency key: %s, using generic address", agency_key)
         return {
             "name": "Citation Review Board",
             "address": "P.O. Box 1234\nAnytown, ST 12345",
@@ -542,11 +542,11 @@ class LobMailService:
             else:
                 # Fallback: Log and return success (for development)
                 logger.info(
-                    f"Generated appeal PDF for citation {request.citation_number}"
+                    "Generated appeal PDF for citation %s", request.citation_number
                 )
-                logger.info(f"Clerical ID: {request.clerical_id}")
-                logger.info(f"Agency: {agency_info['name']}")
-                logger.info(f"Address: {agency_address}")
+                logger.info("Clerical ID: %s", request.clerical_id)
+                logger.info("Agency: %s", agency_info["name"])
+                logger.info("Address: %s", agency_address)
 
                 # Return mock result for development
                 return MailResult(
@@ -557,7 +557,7 @@ class LobMailService:
                 )
 
         except Exception as e:
-            logger.error(f"Failed to send appeal letter: {e}")
+            logger.exception("Failed to send appeal letter")
             return MailResult(success=False, error_message=str(e))
 
     async def _send_via_lob(
@@ -617,7 +617,7 @@ class LobMailService:
             loop = asyncio.get_event_loop()
             letter_obj = await loop.run_in_executor(None, _create_letter)
 
-            logger.info(f"Created Lob letter: {letter_obj.id}")
+            logger.info("Created Lob letter: %s", letter_obj.id)
 
             return MailResult(
                 success=True,
@@ -629,7 +629,7 @@ class LobMailService:
             )
 
         except Exception as e:
-            logger.error(f"Lob API error: {e}")
+            logger.exception("Lob API error")
             return MailResult(success=False, error_message=str(e))
 
     async def verify_address(self, address: MailingAddress) -> Dict[str, Any]:
@@ -681,7 +681,7 @@ class LobMailService:
             }
 
         except Exception as e:
-            logger.error(f"Address verification failed: {e}")
+            logger.error("Address verification failed: %s", e)
             return {
                 "verified": False,
                 "message": str(e),
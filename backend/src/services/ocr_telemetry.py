@@ -6,12 +6,13 @@ for citation number extraction across different cities.
 """
 
 import logging
+import os
 from datetime import datetime
 from typing import Optional
 from dataclasses import dataclass
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, func, select
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 
@@ -82,11 +83,25 @@ class OcrTelemetryService:
     def _get_engine(self):
         """Lazy initialization of database engine."""
         if self._engine is None:
+            # Telemetry is a write-mostly singleton served from the event loop,
+            # so one long-lived connection is enough; no need to hold idle
+            # connections against Postgres.
+            pool_size = int(os.getenv("TELEMETRY_DB_POOL_SIZE", "1"))
+            max_overflow = int(os.getenv("TELEMETRY_DB_MAX_OVERFLOW", "0"))
+
+            connect_args = {}
+            if settings.database_url.startswith("postgresql"):
+                # Losing the last few telemetry rows on a crash is acceptable;
+                # skipping the WAL flush wait roughly doubles insert throughput.
+                connect_args["options"] = "-c synchronous_commit=off"
+
             self._engine = create_engine(
                 settings.database_url,
                 pool_pre_ping=True,
-                pool_size=5,
-                max_overflow=10,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=1800,
+                connect_args=connect_args,
             )
         return self._engine
 
@@ -156,37 +171,55 @@ class OcrTelemetryService:
         Returns:
             Statistics dictionary
         """
+        try:
+            stats = self.get_city_ocr_stats_bulk([city_id])
+        except Exception as e:
+            return {"error": str(e)}
+        return stats.get(city_id, _empty_stats(city_id))
+
+    def get_city_ocr_stats_bulk(self, city_ids: list[str]) -> dict:
+        """
+        Get OCR accuracy statistics for several cities in a single query.
+
+        Args:
+            city_ids: City identifiers
+
+        Returns:
+            Mapping of city_id to statistics dictionary. Cities without any
+            telemetry get zeroed statistics.
+
+        Raises:
+            Exception: If the query fails. Errors are raised rather than
+                returned so they can't be mistaken for a city's entry.
+        """
+        if not city_ids:
+            return {}
+
         try:
             with self.get_session() as session:
-                from sqlalchemy import func
-
-                stats = session.query(
-                    func.count(OcrTelemetry.id).label("total"),
-                    func.avg(OcrTelemetry.ocr_confidence).label("avg_confidence"),
-                    func.sum(
-                        func.cast(OcrTelemetry.user_corrected, Integer)
-                    ).label("corrected_count"),
-                    func.sum(
-                        func.cast(OcrTelemetry.extraction_success, Integer)
-                    ).label("success_count"),
-                ).filter(OcrTelemetry.city_id == city_id).first()
-
-                return {
-                    "city_id": city_id,
-                    "total_ocr_attempts": stats.total or 0,
-                    "avg_confidence": round(stats.avg_confidence or 0, 3),
-                    "correction_rate": round(
-                        (stats.corrected_count or 0) / max(stats.total or 1, 1),
-                        3,
-                    ),
-                    "success_rate": round(
-                        (stats.success_count or 0) / max(stats.total or 1, 1),
-                        3,
-                    ),
-                }
+                stmt = (
+                    select(
+                        OcrTelemetry.city_id,
+                        func.count(OcrTelemetry.id).label("total"),
+                        func.avg(OcrTelemetry.ocr_confidence).label("avg_confidence"),
+                        func.sum(
+                            func.cast(OcrTelemetry.user_corrected, Integer)
+                        ).label("corrected_count"),
+                        func.sum(
+                            func.cast(OcrTelemetry.extraction_success, Integer)
+                        ).label("success_count"),
+                    )
+                    .where(OcrTelemetry.city_id.in_(city_ids))
+                    .group_by(OcrTelemetry.city_id)
+                )
+
+                results = {city_id: _empty_stats(city_id) for city_id in city_ids}
+                for row in session.execute(stmt):
+                    results[row.city_id] = _stats_from_row(row.city_id, row)
+                return results
         except Exception as e:
             logger.error(f"Failed to get OCR stats: {e}")
-            return {"error": str(e)}
+            raise
 
     def get_model_improvement_suggestions(self, city_id: str) -> list:
         """
@@ -221,6 +254,29 @@ class OcrTelemetryService:
         return suggestions
 
 
+def _stats_from_row(city_id: str, row) -> dict:
+    """Build a statistics dictionary from an aggregate result row."""
+    total = row.total or 0
+    return {
+        "city_id": city_id,
+        "total_ocr_attempts": total,
+        "avg_confidence": round(row.avg_confidence or 0, 3),
+        "correction_rate": round((row.corrected_count or 0) / max(total, 1), 3),
+        "success_rate": round((row.success_count or 0) / max(total, 1), 3),
+    }
+
+
+def _empty_stats(city_id: str) -> dict:
+    """Statistics for a city with no recorded telemetry."""
+    return {
+        "city_id": city_id,
+        "total_ocr_attempts": 0,
+        "avg_confidence": 0,
+        "correction_rate": 0,
+        "success_rate": 0,
+    }
+
+
 # Singleton instance
 _telemetry_service: Optional[OcrTelemetryService] = None
 
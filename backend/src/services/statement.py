@@ -15,21 +15,173 @@ Author: Neural Draft LLC
 """
 
 import asyncio
+import functools
+import hashlib
 import logging
 import os
+import random
+import re
 import time
-from datetime import datetime
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Final, Optional
 
+import httpx
+import orjson
 from pydantic import BaseModel
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
 from ..config import settings
-from ..middleware.resilience import CircuitBreaker, create_deepseek_circuit
+from ..middleware.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    create_deepseek_circuit,
+)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# City ID -> issuing agency, read-only so it can be shared across requests
+_CITY_AGENCY = MappingProxyType({
+    "sf": "SFMTA",
+    "us-ca-san_francisco": "SFMTA",
+    "la": "LADOT",
+    "us-ca-los_angeles": "LADOT",
+    "nyc": "NYC Department of Finance",
+    "us-ny-new_york": "NYC Department of Finance",
+    "us-ca-san_diego": "San Diego Transportation Dept",
+    "us-az-phoenix": "Phoenix Transportation Dept",
+    "us-co-denver": "Denver DOTI",
+    "us-il-chicago": "Chicago Department of Finance",
+    "us-or-portland": "Portland Bureau of Transportation",
+    "us-pa-philadelphia": "Philadelphia Parking Authority",
+    "us-tx-dallas": "Dallas Parking Services",
+    "us-tx-houston": "Houston Parking Management",
+    "us-ut-salt_lake_city": "Salt Lake City Transportation",
+    "us-wa-seattle": "Seattle DOT",
+})
+
+# UPL-compliant system prompt sent with every refinement
+_SYSTEM_PROMPT: Final[str] = """You are a Professional Language Articulation and Document Refinement Specialist for FIGHTCITYTICKETS.com.
+
+CRITICAL COMPLIANCE REQUIREMENT - USER VOICE PRESERVATION:
+Your role is to REFINE and ARTICULATE, not to create or modify content. You must PRESERVE:
+- The user's exact factual content and story
+- The user's position and argument
+- The user's chosen points and evidence
+- The user's voice and perspective
+
+You must NEVER:
+- Add legal arguments, strategies, or recommendations
+- Suggest evidence the user didn't provide
+- Interpret laws or regulations
+- Tell the user what they "should" argue
+- Predict outcomes or suggest what will work
+
+You must ALWAYS:
+- Elevate vocabulary while preserving exact meaning
+- Polish grammar and syntax for professionalism
+- Remove profanity and inappropriate language
+- Maintain the user's story and position completely intact
+- Format as a proper formal letter
+
+CORE MISSION:
+Transform the user's own words into exceptionally well-written, professional language. 
+You are a master of articulation and refinement - elevating informal, everyday language 
+into eloquent, respectful, and articulate written communication.
+
+CRITICAL UPL COMPLIANCE (MANDATORY - NEVER VIOLATE):
+1. NEVER provide legal advice, legal strategy, legal recommendations, or legal opinions
+2. NEVER suggest what evidence to include, what arguments to make, or what legal points to raise
+3. NEVER use legal terminology beyond basic formal language (e.g., "respectfully request" is fine, "pursuant to statute" is NOT)
+4. NEVER predict outcomes, suggest legal strategies, or imply what will or won't work legally
+5. NEVER add legal analysis, legal interpretation, legal conclusions, or legal reasoning
+6. NEVER tell the user what they "should" do legally, what they "must" include, or what legal approach to take
+7. ONLY articulate and refine the language the user provides - preserve their facts, their story, their position
+8. NEVER add legal content, legal citations, legal references, or legal frameworks
+
+WHAT YOU EXCEL AT:
+- Elevating vocabulary from everyday to sophisticated and articulate
+- Polishing language to be exceptionally well-written and professional
+- Refining grammar and syntax for maximum clarity and impact
+- Transforming informal speech into articulate, formal written communication
+- Making the user's story sound professional, respectful, and compelling
+- Ensuring language is legally respectable (professional, formal, articulate)
+
+WHAT YOU NEVER DO:
+- Provide legal advice, legal recommendations, or legal opinions
+- Suggest evidence, arguments, or legal strategies
+- Add legal analysis, interpretation, or legal reasoning
+- Predict outcomes or suggest what will work legally
+- Use legal terminology or legal frameworks
+
+INPUT: User's informal statement about their parking ticket situation (may contain casual language, profanity, or informal speech)
+OUTPUT: An exceptionally well-articulated, professionally polished appeal letter with:
+- All profanity and inappropriate language removed
+- Vocabulary significantly elevated while preserving exact meaning
+- Language polished to be sophisticated, articulate, and professional
+- Grammar and syntax refined for maximum clarity and impact
+- Proper formal letter structure
+- User's factual content, story, and position completely preserved
+- Legally respectable tone (professional, formal, articulate)
+- NO legal advice, legal recommendations, or legal expression
+"""
+
+# System message shared by every chat-completion request (never mutated)
+_SYSTEM_MESSAGE: Final[Dict[str, str]] = {"role": "system", "content": _SYSTEM_PROMPT}
+
+# Letter template used when the AI service is unavailable
+_FALLBACK_LETTER: Final[str] = """To Whom It May Concern:
+
+Re: Citation Number {citation_number}
+
+I am writing to formally submit an appeal regarding the above-referenced parking citation.
+
+{body}
+
+Respectfully submitted,
+
+{user_name}"""
+
+# Strips dashes and spaces from citation numbers in a single pass
+_CITATION_STRIP = str.maketrans("", "", "- ")
+
+# Citation prefix -> agency. "LAPD" anywhere wins (empty match, group None),
+# otherwise the leading LA / NY(C) / CH prefix decides.
+_AGENCY_RE = re.compile(r"^(?=.*LAPD)|^(LA|NY|CH)")
+_AGENCY_BY_PREFIX = MappingProxyType({
+    None: "LADOT",
+    "LA": "LADOT",
+    "NY": "NYC Department of Finance",
+    "CH": "Chicago Department of Finance",
+})
+
+# Preambles the model sometimes puts before the letter itself
+_PREFIX_RE = re.compile(
+    r"^(?:here is the refined letter:"
+    r"|here is your professionally formatted letter:"
+    r"|below is the refined statement:"
+    r"|the refined letter is:"
+    r"|your appeal letter:)\s*",
+    re.IGNORECASE,
+)
+
+# LRU of recent successful refinements: request key -> (cached_at, response)
+REFINEMENT_CACHE_SIZE = 512
+REFINEMENT_CACHE_TTL = 3600  # seconds
+_REFINEMENT_CACHE: "OrderedDict[str, tuple[float, StatementRefinementResponse]]" = OrderedDict()
+
+# Flush reclaimable caches when system memory use crosses this percentage
+MEMORY_PRESSURE_PERCENT = 85.0
+MEMORY_CHECK_INTERVAL = 30.0  # seconds
+
+# Shared HTTP client so refinements reuse pooled connections to DeepSeek
+_HTTPX_CLIENT: Optional[httpx.AsyncClient] = None
+
 
 class StatementRefinementRequest(BaseModel):
     """Request model for statement refinement."""
@@ -70,10 +222,26 @@ class DeepSeekService:
     DEFAULT_TIMEOUT = 60.0  # seconds
     RETRY_COUNT = 3
     RETRY_DELAY = 2  # seconds
+    MAX_BACKOFF = 30  # seconds
+    RETRY_BUDGET_PER_MINUTE = 50
+
+    # Concurrent DeepSeek calls; matches the shared client's keep-alive pool
+    # so bursts multiplex over warm connections instead of opening new ones
+    MAX_CONCURRENT_CALLS = 20
+
+    # Streaming: give up on a request that hasn't produced any text by then
+    FIRST_TOKEN_TIMEOUT = 10.0  # seconds
 
     # Rate limiting configuration
     MAX_REFINEMENTS_PER_MINUTE = 5
     MAX_TOKENS_PER_DAY = 1000
+    BUCKET_CAPACITY = float(MAX_REFINEMENTS_PER_MINUTE)
+    BUCKET_RATE = MAX_REFINEMENTS_PER_MINUTE / 60.0  # tokens per second
+
+    # Bounds on rate-limit state so it tracks active clients only
+    MAX_TRACKED_CLIENTS = 10_000
+    EVICTION_INTERVAL = 256  # sweep stale entries every N recorded requests
+    BUCKET_IDLE_SECONDS = 120  # twice the 60s an idle bucket takes to refill
 
     def _ai_fallback(self) -> StatementRefinementResponse:
         """Fallback when circuit breaker is open."""
@@ -92,47 +260,99 @@ class DeepSeekService:
 
     def _check_rate_limit(self, client_ip: str) -> tuple[bool, int]:
         """
-        Check if client is within rate limits.
-        
+        Check if client is within rate limits and consume one refinement.
+
+        Uses a token bucket per client: it holds up to
+        MAX_REFINEMENTS_PER_MINUTE tokens and refills continuously over a
+        minute, so each check is O(1) regardless of request history.
+
         Returns:
             (is_allowed, retry_after_seconds)
         """
-        now = time.time()
-        
-        # Check per-minute limit
-        if client_ip not in self._refinement_count:
-            self._refinement_count[client_ip] = []
-        
-        # Remove old timestamps (older than 1 minute)
-        self._refinement_count[client_ip] = [
-            ts for ts in self._refinement_count[client_ip]
-            if now - ts < 60
-        ]
-        
-        if len(self._refinement_count[client_ip]) >= self.MAX_REFINEMENTS_PER_MINUTE:
-            oldest = self._refinement_count[client_ip][0]
-            retry_after = int(60 - (now - oldest))
-            return False, retry_after
-        
-        # Check daily token limit
-        today = datetime.now().date().isoformat()
-        token_key = f"{client_ip}:{today}"
+        now = time.monotonic()
+
+        # Check daily token limit (keyed by UTC day number, so wall clock)
+        token_key = (client_ip, int(time.time() // 86400))
         if self._token_count.get(token_key, 0) >= self.MAX_TOKENS_PER_DAY:
             return False, 86400  # Retry tomorrow
-        
+
+        # Refill the per-minute bucket for the time elapsed since last check
+        tokens, last_refill = self._buckets.get(
+            client_ip, (self.BUCKET_CAPACITY, now)
+        )
+        tokens = min(
+            self.BUCKET_CAPACITY, tokens + (now - last_refill) * self.BUCKET_RATE
+        )
+
+        if tokens < 1:
+            self._store_bounded(self._buckets, client_ip, (tokens, now))
+            retry_after = int((1 - tokens) / self.BUCKET_RATE) + 1
+            return False, retry_after
+
+        self._store_bounded(self._buckets, client_ip, (tokens - 1, now))
         return True, 0
 
     def _record_request(self, client_ip: str, estimated_tokens: int) -> None:
-        """Record a request for rate limiting."""
-        now = time.time()
-        
-        if client_ip not in self._refinement_count:
-            self._refinement_count[client_ip] = []
-        self._refinement_count[client_ip].append(now)
-        
-        today = datetime.now().date().isoformat()
-        token_key = f"{client_ip}:{today}"
-        self._token_count[token_key] = self._token_count.get(token_key, 0) + estimated_tokens
+        """Record token usage for rate limiting."""
+        token_key = (client_ip, int(time.time() // 86400))
+        self._store_bounded(
+            self._token_count,
+            token_key,
+            self._token_count.get(token_key, 0) + estimated_tokens,
+        )
+
+        self._gc_ticks += 1
+        if self._gc_ticks >= self.EVICTION_INTERVAL:
+            self._gc_ticks = 0
+            self._evict_stale()
+
+    def _store_bounded(self, store: OrderedDict, key: Any, value: Any) -> None:
+        """Insert into an LRU-ordered store, dropping the oldest entry on overflow."""
+        store[key] = value
+        store.move_to_end(key)
+        if len(store) > self.MAX_TRACKED_CLIENTS:
+            store.popitem(last=False)
+
+    def _evict_stale(self) -> None:
+        """Drop idle token buckets and daily token counts from previous days."""
+        cutoff = time.monotonic() - self.BUCKET_IDLE_SECONDS
+        for ip in [ip for ip, (_, last) in self._buckets.items() if last < cutoff]:
+            del self._buckets[ip]
+
+        today = int(time.time() // 86400)
+        for key in [k for k in self._token_count if k[1] != today]:
+            del self._token_count[key]
+
+    def on_memory_pressure(self) -> None:
+        """
+        Release reclaimable state when the host is running low on memory.
+
+        Drops finished in-flight entries, shrinks the refinement cache to a
+        tenth of its capacity and forgets token buckets that have refilled
+        completely (an absent bucket is treated as full anyway).
+        """
+        for key in [k for k, task in self._inflight.items() if task.done()]:
+            del self._inflight[key]
+
+        keep = REFINEMENT_CACHE_SIZE // 10
+        while len(_REFINEMENT_CACHE) > keep:
+            _REFINEMENT_CACHE.popitem(last=False)
+
+        now = time.monotonic()
+        full = [
+            ip
+            for ip, (tokens, last) in self._buckets.items()
+            if tokens + (now - last) * self.BUCKET_RATE >= self.BUCKET_CAPACITY
+        ]
+        for ip in full:
+            del self._buckets[ip]
+
+        logger.warning(
+            "Memory pressure: trimmed refinement cache to %d entries, "
+            "dropped %d idle rate-limit buckets",
+            len(_REFINEMENT_CACHE),
+            len(full),
+        )
 
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -148,75 +368,19 @@ class DeepSeekService:
         # Circuit breaker for AI API resilience
         self._circuit_breaker = create_deepseek_circuit(fallback=self._ai_fallback)
         # Rate limiting tracking
-        self._refinement_count: Dict[str, list] = {}  # IP -> timestamps
-        self._token_count: Dict[str, int] = {}  # IP -> token count
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()  # IP -> (tokens, last_refill)
+        self._token_count: OrderedDict[tuple[str, int], int] = OrderedDict()  # (IP, day) -> token count
+        self._gc_ticks = 0
+        # Request key -> shared task for identical concurrent refinements
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._call_slots = asyncio.Semaphore(self.MAX_CONCURRENT_CALLS)
+        # Retry budget tracking (retries in the current one-minute window)
+        self._retry_window_start = 0.0
+        self._retries_in_window = 0
 
     def _get_system_prompt(self) -> str:
         """Get the UPL-compliant system prompt for DeepSeek."""
-        return """You are a Professional Language Articulation and Document Refinement Specialist for FIGHTCITYTICKETS.com.
-
-CRITICAL COMPLIANCE REQUIREMENT - USER VOICE PRESERVATION:
-Your role is to REFINE and ARTICULATE, not to create or modify content. You must PRESERVE:
-- The user's exact factual content and story
-- The user's position and argument
-- The user's chosen points and evidence
-- The user's voice and perspective
-
-You must NEVER:
-- Add legal arguments, strategies, or recommendations
-- Suggest evidence the user didn't provide
-- Interpret laws or regulations
-- Tell the user what they "should" argue
-- Predict outcomes or suggest what will work
-
-You must ALWAYS:
-- Elevate vocabulary while preserving exact meaning
-- Polish grammar and syntax for professionalism
-- Remove profanity and inappropriate language
-- Maintain the user's story and position completely intact
-- Format as a proper formal letter
-
-CORE MISSION:
-Transform the user's own words into exceptionally well-written, professional language. 
-You are a master of articulation and refinement - elevating informal, everyday language 
-into eloquent, respectful, and articulate written communication.
-
-CRITICAL UPL COMPLIANCE (MANDATORY - NEVER VIOLATE):
-1. NEVER provide legal advice, legal strategy, legal recommendations, or legal opinions
-2. NEVER suggest what evidence to include, what arguments to make, or what legal points to raise
-3. NEVER use legal terminology beyond basic formal language (e.g., "respectfully request" is fine, "pursuant to statute" is NOT)
-4. NEVER predict outcomes, suggest legal strategies, or imply what will or won't work legally
-5. NEVER add legal analysis, legal interpretation, legal conclusions, or legal reasoning
-6. NEVER tell the user what they "should" do legally, what they "must" include, or what legal approach to take
-7. ONLY articulate and refine the language the user provides - preserve their facts, their story, their position
-8. NEVER add legal content, legal citations, legal references, or legal frameworks
-
-WHAT YOU EXCEL AT:
-- Elevating vocabulary from everyday to sophisticated and articulate
-- Polishing language to be exceptionally well-written and professional
-- Refining grammar and syntax for maximum clarity and impact
-- Transforming informal speech into articulate, formal written communication
-- Making the user's story sound professional, respectful, and compelling
-- Ensuring language is legally respectable (professional, formal, articulate)
-
-WHAT YOU NEVER DO:
-- Provide legal advice, legal recommendations, or legal opinions
-- Suggest evidence, arguments, or legal strategies
-- Add legal analysis, interpretation, or legal reasoning
-- Predict outcomes or suggest what will work legally
-- Use legal terminology or legal frameworks
-
-INPUT: User's informal statement about their parking ticket situation (may contain casual language, profanity, or informal speech)
-OUTPUT: An exceptionally well-articulated, professionally polished appeal letter with:
-- All profanity and inappropriate language removed
-- Vocabulary significantly elevated while preserving exact meaning
-- Language polished to be sophisticated, articulate, and professional
-- Grammar and syntax refined for maximum clarity and impact
-- Proper formal letter structure
-- User's factual content, story, and position completely preserved
-- Legally respectable tone (professional, formal, articulate)
-- NO legal advice, legal recommendations, or legal expression
-"""
+        return _SYSTEM_PROMPT
 
     def _create_refinement_prompt(self, request: StatementRefinementRequest) -> str:
         """Create the user prompt for statement refinement."""
@@ -247,67 +411,30 @@ that:
 Write only the letter body. Do not include headers or footers (these are
 added by the Clerical Engine™ automatically)."""
 
-    def _detect_agency(
-        self, citation_number: str, city_id: Optional[str] = None
-    ) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _detect_agency(citation_number: str, city_id: Optional[str] = None) -> str:
         """Detect the agency from citation number pattern or city ID."""
-        if city_id:
-            city_mappings = {
-                "sf": "SFMTA",
-                "us-ca-san_francisco": "SFMTA",
-                "la": "LADOT",
-                "us-ca-los_angeles": "LADOT",
-                "nyc": "NYC Department of Finance",
-                "us-ny-new_york": "NYC Department of Finance",
-                "us-ca-san_diego": "San Diego Transportation Dept",
-                "us-az-phoenix": "Phoenix Transportation Dept",
-                "us-co-denver": "Denver DOTI",
-                "us-il-chicago": "Chicago Department of Finance",
-                "us-or-portland": "Portland Bureau of Transportation",
-                "us-pa-philadelphia": "Philadelphia Parking Authority",
-                "us-tx-dallas": "Dallas Parking Services",
-                "us-tx-houston": "Houston Parking Management",
-                "us-ut-salt_lake_city": "Salt Lake City Transportation",
-                "us-wa-seattle": "Seattle DOT",
-            }
-            if city_id in city_mappings:
-                return city_mappings[city_id]
+        if city_id and city_id in _CITY_AGENCY:
+            return _CITY_AGENCY[city_id]
 
         # Fallback: detect from citation number pattern
-        citation_clean = citation_number.upper().replace("-", "").replace(" ", "")
+        citation_clean = citation_number.upper().translate(_CITATION_STRIP)
 
         if citation_clean.isdigit() and len(citation_clean) <= 9:
             # Likely SF pattern
             return "SFMTA"
-        elif citation_clean.startswith("LA") or "LAPD" in citation_clean:
-            return "LADOT"
-        elif citation_clean.startswith("NYC") or citation_clean.startswith("NY"):
-            return "NYC Department of Finance"
-        elif citation_clean.startswith("CH"):
-            return "Chicago Department of Finance"
+
+        match = _AGENCY_RE.match(citation_clean)
+        if match:
+            return _AGENCY_BY_PREFIX[match.group(1)]
 
         return "Citation Review Board"
 
     def _clean_response(self, response: str) -> str:
         """Clean and normalize the AI response."""
-        # Remove common AI artifacts
-        cleaned = response.strip()
-
-        # Remove "Here is your refined letter:" or similar prefixes
-        prefixes_to_remove = [
-            "Here is the refined letter:",
-            "Here is your professionally formatted letter:",
-            "Below is the refined statement:",
-            "The refined letter is:",
-            "Your appeal letter:",
-        ]
-        for prefix in prefixes_to_remove:
-            if cleaned.lower().startswith(prefix.lower()):
-                cleaned = cleaned[len(prefix) :].strip()
-
-        # Remove any "Dear Citation Review Board" if it appears (added by system)
-        # The system adds salutation automatically
-        return cleaned
+        # Remove "Here is your refined letter:" or similar prefixes in one pass
+        return _PREFIX_RE.sub("", response.strip(), count=1)
 
     def _has_proper_structure(self, text: str) -> bool:
         """Check if the refined text has proper letter structure."""
@@ -319,51 +446,82 @@ added by the Clerical Engine™ automatically)."""
     async def refine_statement_async(
         self, request: StatementRefinementRequest
     ) -> StatementRefinementResponse:
-        """Refine a user statement using DeepSeek AI with retries."""
-        import time
-        import httpx
+        """
+        Refine a user statement using DeepSeek AI with retries.
 
-        start_time = time.time()
+        Identical requests that arrive while one is already in flight share
+        its result instead of issuing another API call.
+        """
+        key = _request_key(request)
+
+        cached = _REFINEMENT_CACHE.get(key)
+        if cached is not None:
+            cached_at, response = cached
+            if time.monotonic() - cached_at < REFINEMENT_CACHE_TTL:
+                _REFINEMENT_CACHE.move_to_end(key)
+                return response.model_copy()
+            del _REFINEMENT_CACHE[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refine_with_retries(request))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._forget_inflight, key))
+            task.add_done_callback(functools.partial(_cache_refinement, key))
+
+        # Shield so one caller disconnecting doesn't cancel the shared call
+        result = await asyncio.shield(task)
+        return result.model_copy()
+
+    def _forget_inflight(self, key: str, task: "asyncio.Future") -> None:
+        """Drop a finished in-flight entry (if it hasn't been replaced)."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _refine_with_retries(
+        self, request: StatementRefinementRequest
+    ) -> StatementRefinementResponse:
+        """Call DeepSeek with retries, falling back to local refinement."""
+        start_time = time.monotonic()
         original_text = request.appeal_reason
 
+        # Fail fast while DeepSeek is known to be down: skip prompt building
+        # and the HTTP round trip entirely
+        if self._circuit_breaker.is_open():
+            return self._fallback_response(request, start_time)
+
+        # The body is identical on every attempt, so serialize it once
+        body = orjson.dumps({
+            "model": "deepseek-chat",
+            "messages": [
+                _SYSTEM_MESSAGE,
+                {"role": "user", "content": self._create_refinement_prompt(request)},
+            ],
+            "temperature": 0.3,
+            "max_tokens": 2000,
+            "stream": True,
+        })
+
         # Retry logic for transient failures
         last_error = None
         for attempt in range(self.RETRY_COUNT):
             try:
-                async with httpx.AsyncClient(timeout=self.DEFAULT_TIMEOUT) as client:
-                    response = await client.post(
-                        self.API_URL,
-                        headers={
-                            "Authorization": f"Bearer {self.api_key}",
-                            "Content-Type": "application/json",
-                        },
-                        json={
-                            "model": "deepseek-chat",
-                            "messages": [
-                                {"role": "system", "content": self._get_system_prompt()},
-                                {
-                                    "role": "user",
-                                    "content": self._create_refinement_prompt(request),
-                                },
-                            ],
-                            "temperature": 0.3,
-                            "max_tokens": 2000,
-                            "stream": False,
-                        },
-                    )
+                # Only timeouts, network errors and 5xx count against the
+                # breaker; a malformed stream is re-raised once it has exited
+                async with self._call_slots, self._circuit_breaker:
+                    response, refined_text, parse_error = await self._stream_completion(body)
+                if parse_error is not None:
+                    raise parse_error
 
                 response.raise_for_status()
-                data = response.json()
-
-                refined_text = data["choices"][0]["message"]["content"]
                 refined_text = self._clean_response(refined_text)
 
                 # Fallback validation
                 if not self._has_proper_structure(refined_text):
                     logger.warning("AI response lacks proper structure, using fallback")
-                    refined_text = self._local_fallback_refinement(request)
+                    return self._fallback_response(request, start_time)
 
-                processing_time = int((time.time() - start_time) * 1000)
+                processing_time = int((time.monotonic() - start_time) * 1000)
 
                 return StatementRefinementResponse(
                     refined_text=refined_text,
@@ -372,83 +530,264 @@ added by the Clerical Engine™ automatically)."""
                     processing_time_ms=processing_time,
                 )
 
+            except CircuitOpenError:
+                logger.warning("DeepSeek circuit opened during retries, using fallback")
+                return self._fallback_response(request, start_time)
+
             except httpx.TimeoutException as e:
                 last_error = e
-                logger.warning(f"DeepSeek timeout (attempt {attempt + 1}/{self.RETRY_COUNT})")
-                if attempt < self.RETRY_COUNT - 1:
-                    await asyncio.sleep(self.RETRY_DELAY * (2 ** attempt))  # Exponential backoff
+                logger.warning(
+                    "DeepSeek timeout (attempt %d/%d)", attempt + 1, self.RETRY_COUNT
+                )
+                if not await self._backoff(attempt):
+                    break
 
             except httpx.NetworkError as e:
                 last_error = e
-                logger.warning(f"DeepSeek network error (attempt {attempt + 1}/{self.RETRY_COUNT})")
-                if attempt < self.RETRY_COUNT - 1:
-                    await asyncio.sleep(self.RETRY_DELAY * (2 ** attempt))
+                logger.warning(
+                    "DeepSeek network error (attempt %d/%d)",
+                    attempt + 1,
+                    self.RETRY_COUNT,
+                )
+                if not await self._backoff(attempt):
+                    break
 
             except httpx.HTTPStatusError as e:
                 # Retry on 5xx errors, but not on 4xx
                 if e.response.status_code >= 500:
                     last_error = e
-                    logger.warning(f"DeepSeek server error {e.response.status_code} (attempt {attempt + 1}/{self.RETRY_COUNT})")
-                    if attempt < self.RETRY_COUNT - 1:
-                        await asyncio.sleep(self.RETRY_DELAY * (2 ** attempt))
+                    logger.warning(
+                        "DeepSeek server error %d (attempt %d/%d)",
+                        e.response.status_code,
+                        attempt + 1,
+                        self.RETRY_COUNT,
+                    )
+                    if not await self._backoff(attempt):
+                        break
                 else:
                     # Non-retryable client error
-                    logger.error(f"DeepSeek client error: {e}")
+                    logger.error("DeepSeek client error: %s", e)
                     break
 
             except Exception as e:
-                logger.error(f"DeepSeek API error: {e}")
+                logger.error("DeepSeek API error: %s", e)
                 break
 
         # All retries exhausted or non-retryable error - fallback to local refinement
-        logger.error(f"DeepSeek failed after {self.RETRY_COUNT} attempts: {last_error}")
-        refined_text = self._local_fallback_refinement(request)
-        processing_time = int((time.time() - start_time) * 1000)
+        logger.error(
+            "DeepSeek failed after %d attempts: %s", self.RETRY_COUNT, last_error
+        )
+        return self._fallback_response(request, start_time)
+
+    async def _backoff(self, attempt: int) -> bool:
+        """
+        Sleep before retrying a failed attempt.
+
+        Uses full jitter (uniform between 0 and the exponential delay) so
+        concurrent callers don't retry in lockstep, and enforces a
+        process-wide retry budget so an outage doesn't multiply load.
+
+        Returns:
+            False if no further attempt should be made.
+        """
+        if attempt >= self.RETRY_COUNT - 1:
+            return False
+
+        now = time.monotonic()
+        if now - self._retry_window_start >= 60:
+            self._retry_window_start = now
+            self._retries_in_window = 0
+        if self._retries_in_window >= self.RETRY_BUDGET_PER_MINUTE:
+            logger.warning("DeepSeek retry budget exhausted, skipping retries")
+            return False
+        self._retries_in_window += 1
+
+        delay = min(self.MAX_BACKOFF, self.RETRY_DELAY * (2 ** attempt))
+        await asyncio.sleep(random.uniform(0, delay))
+        return True
+
+    async def _stream_completion(
+        self, body: bytes
+    ) -> tuple[httpx.Response, str, Optional[Exception]]:
+        """
+        POST a streaming chat completion and collect the generated text.
+
+        Server-sent ``data:`` chunks are parsed as they arrive. A stream that
+        produces no content within FIRST_TOKEN_TIMEOUT (or doesn't finish
+        within DEFAULT_TIMEOUT) raises httpx.ReadTimeout, so a stalled
+        provider is detected in seconds rather than after the full timeout.
+
+        Returns:
+            (response, text, parse_error). For 4xx responses the text is empty
+            and the caller decides how to handle the status; 5xx raises here.
+            A chunk that fails to parse ends the stream and is returned as
+            parse_error rather than raised, so it doesn't trip the breaker.
+        """
+        started = time.monotonic()
+        deadline = started + self.DEFAULT_TIMEOUT
+        first_token_deadline = started + self.FIRST_TOKEN_TIMEOUT
+        parts: list[str] = []
+
+        async with _get_client().stream(
+            "POST",
+            self.API_URL,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            content=body,
+        ) as response:
+            if response.status_code >= 500:
+                response.raise_for_status()
+            if response.is_error:
+                return response, "", None
+
+            lines = response.aiter_lines()
+            while True:
+                limit = deadline if parts else min(deadline, first_token_deadline)
+                try:
+                    line = await asyncio.wait_for(
+                        lines.__anext__(), timeout=max(limit - time.monotonic(), 0)
+                    )
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError as e:
+                    stage = "first token" if not parts else "completion"
+                    raise httpx.ReadTimeout(
+                        f"DeepSeek stream timed out waiting for {stage}"
+                    ) from e
+
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
 
+                try:
+                    delta = orjson.loads(payload)["choices"][0].get("delta") or {}
+                except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                    return response, "".join(parts), e
+                if delta.get("content"):
+                    parts.append(delta["content"])
+
+        return response, "".join(parts), None
+
+    def _fallback_response(
+        self, request: StatementRefinementRequest, start_time: float
+    ) -> StatementRefinementResponse:
+        """Local refinement returned when DeepSeek can't produce a letter."""
         return StatementRefinementResponse(
-            refined_text=refined_text,
-            original_text=original_text,
+            refined_text=self._local_fallback_refinement(request),
+            original_text=request.appeal_reason,
             citation_number=request.citation_number,
-            processing_time_ms=processing_time,
+            processing_time_ms=int((time.monotonic() - start_time) * 1000),
+            model_used="fallback",
+            status="fallback",
+            fallback_used=True,
         )
 
     def _local_fallback_refinement(self, request: StatementRefinementRequest) -> str:
         """Local fallback when AI is unavailable."""
-        agency = self._detect_agency(request.citation_number, request.city_id)
+        # Drop blank lines and any salutation the user wrote themselves
+        body = " ".join(
+            line
+            for line in (raw.strip() for raw in request.appeal_reason.split("\n"))
+            if line and line[:4].lower() != "dear"
+        )
 
-        # Professional template with user content
-        user_content = request.appeal_reason.strip()
+        # Ensure proper punctuation and capitalization
+        if body and body[-1] not in ".!?":
+            body += "."
 
-        # Clean up user content
-        lines = user_content.split("\n")
-        cleaned_lines = []
-        for line in lines:
-            line = line.strip()
-            if line and not line.lower().startswith("dear"):
-                cleaned_lines.append(line)
+        return _FALLBACK_LETTER.format(
+            citation_number=request.citation_number,
+            body=body,
+            user_name=request.user_name or "Citizen",
+        )
 
-        body = " ".join(cleaned_lines)
 
-        # Ensure proper punctuation and capitalization
-        if body and not body[-1] in ".!?":
-            body += "."
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared DeepSeek HTTP client, creating it on first use."""
+    global _HTTPX_CLIENT
+    if _HTTPX_CLIENT is None or _HTTPX_CLIENT.is_closed:
+        _HTTPX_CLIENT = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=DeepSeekService.MAX_CONCURRENT_CALLS,
+            ),
+            timeout=DeepSeekService.DEFAULT_TIMEOUT,
+        )
+    return _HTTPX_CLIENT
 
-        return f"""To Whom It May Concern:
 
-Re: Citation Number {request.citation_number}
+async def close_http_client() -> None:
+    """Close the shared DeepSeek HTTP client (called on app shutdown)."""
+    global _HTTPX_CLIENT
+    if _HTTPX_CLIENT is not None:
+        await _HTTPX_CLIENT.aclose()
+        _HTTPX_CLIENT = None
 
-I am writing to formally submit an appeal regarding the above-referenced parking citation.
 
-{body}
+async def watch_memory_pressure(
+    interval: float = MEMORY_CHECK_INTERVAL,
+    threshold: float = MEMORY_PRESSURE_PERCENT,
+) -> None:
+    """
+    Poll system memory and flush DeepSeek caches when usage crosses threshold.
 
-Respectfully submitted,
+    Runs until cancelled (started and stopped from the app lifespan). Does
+    nothing if psutil is not installed.
+    """
+    if not PSUTIL_AVAILABLE:
+        logger.info("psutil not installed, memory pressure watcher disabled")
+        return
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if psutil.virtual_memory().percent > threshold:
+                get_statement_service().on_memory_pressure()
+        except Exception as e:
+            logger.error("Memory pressure check failed: %s", e)
+
+
+def _request_key(request: StatementRefinementRequest) -> str:
+    """Hash every field that shapes the refinement into a dedup key."""
+    return hashlib.blake2b(
+        request.model_dump_json().encode(), digest_size=16
+    ).hexdigest()
 
-{request.user_name or "Citizen"}"""
+
+def _cache_refinement(key: str, task: "asyncio.Future") -> None:
+    """Remember a successful AI refinement; fallbacks are never cached."""
+    if task.cancelled() or task.exception() is not None:
+        return
+    result = task.result()
+    if result.status != "completed" or result.fallback_used:
+        return
+
+    _REFINEMENT_CACHE[key] = (time.monotonic(), result)
+    _REFINEMENT_CACHE.move_to_end(key)
+    if len(_REFINEMENT_CACHE) > REFINEMENT_CACHE_SIZE:
+        _REFINEMENT_CACHE.popitem(last=False)
+
+
+# Global service instance
+_statement_service: Optional[DeepSeekService] = None
 
 
 def get_statement_service() -> DeepSeekService:
-    """Get an instance of the DeepSeek service."""
-    return DeepSeekService()
+    """
+    Get the global DeepSeek service instance.
+
+    Shared so the circuit breaker and rate-limit state persist across
+    requests instead of being reset per call.
+    """
+    global _statement_service
+    if _statement_service is None:
+        _statement_service = DeepSeekService()
+    return _statement_service
 
 
 async def refine_statement(
@@ -1,31 +1,62 @@
 """
 Storage Service for handling S3 uploads and file management.
 """
+import asyncio
+import functools
 import logging
+from urllib.parse import quote
+
 import boto3
-from botocore.exceptions import ClientError
+from botocore.auth import S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+from botocore.exceptions import BotoCoreError, ClientError
 from typing import Optional, Dict, Any
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# The single StorageService implementation; extend this class rather than
+# redefining it elsewhere in the module.
 class StorageService:
     def __init__(self):
         self.bucket_name = settings.s3_bucket_name
         self.region = settings.aws_region
 
-        if settings.aws_access_key_id and settings.aws_secret_access_key:
+        bucket_set = bool(self.bucket_name and self.bucket_name != "change-me")
+        if bucket_set and settings.aws_access_key_id and settings.aws_secret_access_key:
             self.s3_client = boto3.client(
                 's3',
                 aws_access_key_id=settings.aws_access_key_id,
                 aws_secret_access_key=settings.aws_secret_access_key,
                 region_name=self.region
             )
+            # Presigned URLs are signed locally with these credentials
+            self._credentials = Credentials(
+                settings.aws_access_key_id, settings.aws_secret_access_key
+            )
             self.is_configured = True
         else:
             self.s3_client = None
+            self._credentials = None
             self.is_configured = False
-            logger.warning("AWS S3 credentials not configured. S3 storage disabled.")
+            logger.warning("AWS S3 bucket or credentials not configured. S3 storage disabled.")
+
+        # Public URL only varies by key, so build the template once
+        self._public_url_template = (
+            f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{{key}}"
+        )
+        self._signers: Dict[int, S3SigV4QueryAuth] = {}
+
+    def _get_signer(self, expiration: int) -> S3SigV4QueryAuth:
+        """Get a SigV4 query signer for the given expiry, built once per value."""
+        signer = self._signers.get(expiration)
+        if signer is None:
+            signer = S3SigV4QueryAuth(
+                self._credentials, "s3", self.region, expires=expiration
+            )
+            self._signers[expiration] = signer
+        return signer
 
     def generate_presigned_url(
         self,
@@ -36,6 +67,12 @@ class StorageService:
         """
         Generate a presigned URL to upload an S3 object.
 
+        The URL is signed locally for the regional virtual-hosted endpoint
+        (bucket.s3.region.amazonaws.com). Not supported: bucket names
+        containing dots (they fail TLS against the *.s3 wildcard
+        certificate) and temporary credentials that need a session token.
+        Use self.s3_client.generate_presigned_url for either case.
+
         :param object_name: string
         :param file_type: string (MIME type)
         :param expiration: Time in seconds for the presigned URL to remain valid
@@ -46,34 +83,58 @@ class StorageService:
             return None
 
         try:
-            # Generate a presigned URL for the S3 object
-            # For PUT uploads (simpler for single file upload from frontend)
-            response = self.s3_client.generate_presigned_url(
-                'put_object',
-                Params={
-                    'Bucket': self.bucket_name,
-                    'Key': object_name,
-                    'ContentType': file_type
-                },
-                ExpiresIn=expiration
+            # Sign a PUT URL directly with SigV4 query auth (same result as
+            # s3_client.generate_presigned_url('put_object', ...) without
+            # botocore's per-call request model and endpoint resolution)
+            request = AWSRequest(
+                method="PUT",
+                url=self._public_url_template.format(
+                    key=quote(object_name, safe="/~")
+                ),
+                headers={"Content-Type": file_type},
             )
+            self._get_signer(expiration).add_auth(request)
 
-            # For PUT, the response is just the string URL
             return {
-                "upload_url": response,
+                "upload_url": request.url,
                 "key": object_name,
                 # Note: public_url assumes public access or that we will generate a GET URL later
-                "public_url": f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{object_name}"
+                "public_url": self._public_url_template.format(key=object_name)
             }
-        except ClientError as e:
+        except (BotoCoreError, ClientError) as e:
             logger.error(f"Error generating presigned URL: {e}")
             return None
 
+    async def generate_presigned_url_async(
+        self,
+        object_name: str,
+        file_type: str,
+        expiration: int = 3600
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of generate_presigned_url.
+
+        Runs botocore signing in the default executor so async handlers
+        don't stall the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.generate_presigned_url, object_name, file_type, expiration
+            ),
+        )
+
 # Global service instance
 _storage_service = None
 
 def get_storage_service() -> StorageService:
-    """Get the global Storage service instance."""
+    """
+    Get the global Storage service instance.
+
+    The boto3 client is built once per process (botocore model loading is
+    slow) and is thread-safe, so every caller shares it.
+    """
     global _storage_service
     if _storage_service is None:
         _storage_service = StorageService()
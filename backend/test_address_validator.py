@@ -23,6 +23,10 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.services.address_validator import get_address_validator, AddressValidator
 
+# Resolved once; adjust depending on where this script is run from
+_HERE = Path(__file__).parent
+CITIES_DIR = _HERE / "cities" if (_HERE / "cities").exists() else _HERE.parent / "cities"
+
 
 def test_address_normalization():
     """Test address normalization logic."""
@@ -31,15 +35,10 @@ def test_address_normalization():
     print("=" * 80)
     print()
 
-    cities_dir = Path(__file__).parent / "cities"
-    # Adjust path if needed depending on where this script is run
-    if not cities_dir.exists():
-         cities_dir = Path(__file__).parent.parent / "cities"
-
     # Mock validator or use real one if dependencies allow
     # For this standalone test we might need to mock if dependencies are missing
     try:
-        validator = AddressValidator(cities_dir)
+        validator = AddressValidator(CITIES_DIR)
     except Exception as e:
         print(f"Skipping normalization test due to init error: {e}")
         return True
@@ -82,22 +81,19 @@ def test_address_normalization():
     print(f"Testing {len(test_cases)} address normalization cases...")
     print()
 
+    # Normalize every input and comparison string in one pass
+    normalize = validator._normalize_address
+    inputs = list(map(normalize, [case[0] for case in test_cases]))
+    compares = list(map(normalize, [case[2] for case in test_cases]))
+
     passed = 0
     failed = 0
+    lines = []
 
-    for i, test_input in enumerate(test_cases, 1):
-        normalized1 = validator._normalize_address(test_input[0])
-
-        if len(test_input) == 3:
-            expected = test_input[1]
-            compare_with = test_input[2]
-            should_match = True
-        else:
-            expected = test_input[1]
-            compare_with = test_input[2]
-            should_match = test_input[3] if len(test_input) > 3 else True
-
-        normalized2 = validator._normalize_address(compare_with)
+    for i, (test_input, normalized1, normalized2) in enumerate(
+        zip(test_cases, inputs, compares), 1
+    ):
+        should_match = test_input[3] if len(test_input) > 3 else True
         matches = normalized1 == normalized2
         status = "PASS" if matches == should_match else "FAIL"
 
@@ -106,12 +102,14 @@ def test_address_normalization():
         else:
             failed += 1
 
-        print(f"Test {i}: {status}")
-        print(f"  Input: '{test_input[0]}'")
-        print(f"  Normalized: '{normalized1}'")
+        lines.append(f"Test {i}: {status}")
+        lines.append(f"  Input: '{test_input[0]}'")
+        lines.append(f"  Normalized: '{normalized1}'")
         if matches != should_match:
-            print(f"  Expected match: {should_match}, Got: {matches}")
-        print()
+            lines.append(f"  Expected match: {should_match}, Got: {matches}")
+        lines.append("")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print("=" * 80)
     print(f"NORMALIZATION TESTS: {passed} passed, {failed} failed")
@@ -128,12 +126,8 @@ def test_address_parsing():
     print("=" * 80)
     print()
 
-    cities_dir = Path(__file__).parent / "cities"
-    if not cities_dir.exists():
-         cities_dir = Path(__file__).parent.parent / "cities"
-
     try:
-        validator = AddressValidator(cities_dir)
+        validator = AddressValidator(CITIES_DIR)
     except:
         return True
 
@@ -197,12 +191,8 @@ def test_stored_address_extraction():
     print("=" * 80)
     print()
 
-    cities_dir = Path(__file__).parent / "cities"
-    if not cities_dir.exists():
-         cities_dir = Path(__file__).parent.parent / "cities"
-
     try:
-        validator = AddressValidator(cities_dir)
+        validator = AddressValidator(CITIES_DIR)
     except:
         return True
 
@@ -293,5 +283,12 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
+    # Same event loop the server runs under (uvicorn --loop uvloop), if installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     success = asyncio.run(run_all_tests(api=args.api, city=args.city))
     sys.exit(0 if success else 1)
@@ -0,0 +1,88 @@
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient shared by the whole run; the app lifespan runs once."""
+    from fastapi.testclient import TestClient
+
+    from src.app import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def mock_email_service():
+    """Email service stand-in wired into the address validator."""
+    service = AsyncMock()
+    service.send_admin_alert = AsyncMock(return_value=True)
+    with patch("backend.src.services.address_validator.get_email_service", return_value=service):
+        yield service
+
+
+class ScrapeLog:
+    """
+    In-memory ScrapedPage table standing in for the address validator's DB.
+
+    The validator's failure alerts read the last three ScrapedPage rows for
+    a city, so tests record scrapes here the way _scrape_url would.
+    """
+
+    def __init__(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from backend.src.models import ScrapedPage
+
+        self._model = ScrapedPage
+        engine = create_engine("sqlite://")
+        ScrapedPage.__table__.create(engine)
+        self._sessions = sessionmaker(bind=engine, expire_on_commit=False)
+        self._started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self._count = 0
+
+    @contextmanager
+    def get_session(self):
+        session = self._sessions()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    def record(self, city_id: str, status: str) -> None:
+        """Add one scrape row; timestamps increase so "most recent" is exact."""
+        self._count += 1
+        with self.get_session() as session:
+            session.add(
+                self._model(
+                    city_id=city_id,
+                    url=f"http://{city_id}.test",
+                    status=status,
+                    scrape_timestamp=self._started + timedelta(minutes=self._count),
+                    expires_at=self._started + timedelta(days=90),
+                )
+            )
+
+    def statuses(self, city_id: str) -> list:
+        """Statuses recorded for a city, oldest first."""
+        with self.get_session() as session:
+            rows = (
+                session.query(self._model)
+                .filter(self._model.city_id == city_id)
+                .order_by(self._model.scrape_timestamp)
+                .all()
+            )
+            return [row.status for row in rows]
+
+
+@pytest.fixture
+def scrape_log():
+    """Fresh ScrapeLog wired in as the address validator's DB service."""
+    log = ScrapeLog()
+    with patch("backend.src.services.address_validator.get_db_service", return_value=log):
+        yield log
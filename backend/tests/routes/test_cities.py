@@ -1,5 +1,4 @@
 import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, patch
 import sys
 from pathlib import Path
@@ -9,23 +8,22 @@ backend_dir = str(Path(__file__).parents[2])
 if backend_dir not in sys.path:
     sys.path.append(backend_dir)
 
-from src.app import app
 from src.services.city_registry import CityRegistry
 
-client = TestClient(app)
+# Spec'd once for the module; mock_registry resets it between tests
+_REGISTRY = MagicMock(spec=CityRegistry)
 
 @pytest.fixture
 def mock_registry():
-    # Create a mock registry
-    mock_reg = MagicMock(spec=CityRegistry)
+    _REGISTRY.reset_mock()
     # Set up default return values
-    mock_reg.get_all_cities.return_value = []
+    _REGISTRY.get_all_cities.return_value = []
 
     # Patch get_registry in the cities route module
-    with patch("src.routes.cities.get_registry", return_value=mock_reg):
-        yield mock_reg
+    with patch("src.routes.cities.get_registry", return_value=_REGISTRY):
+        yield _REGISTRY
 
-def test_get_cities_endpoint_no_filter(mock_registry):
+def test_get_cities_endpoint_no_filter(client, mock_registry):
     # Setup mock data
     mock_registry.get_all_cities.return_value = [
         {"city_id": "city1", "name": "City 1", "is_eligible": True},
@@ -39,7 +37,7 @@ def test_get_cities_endpoint_no_filter(mock_registry):
     assert len(data) == 2
     mock_registry.get_all_cities.assert_called_with(eligible_only=False)
 
-def test_get_cities_endpoint_with_filter(mock_registry):
+def test_get_cities_endpoint_with_filter(client, mock_registry):
     # Setup mock data
     mock_registry.get_all_cities.return_value = [
         {"city_id": "city1", "name": "City 1", "is_eligible": True},
@@ -52,7 +50,7 @@ def test_get_cities_endpoint_with_filter(mock_registry):
     assert len(data) == 1
     mock_registry.get_all_cities.assert_called_with(eligible_only=True)
 
-def test_get_cities_endpoint_with_false_filter(mock_registry):
+def test_get_cities_endpoint_with_false_filter(client, mock_registry):
     response = client.get("/cities/?eligible=false")
     assert response.status_code == 200
     mock_registry.get_all_cities.assert_called_with(eligible_only=False)
@@ -0,0 +1,47 @@
+import pytest
+from unittest.mock import MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend directory to path so imports work
+backend_dir = str(Path(__file__).parents[2])
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+from src.services.ocr_telemetry import OcrTelemetryService
+
+
+@pytest.fixture
+def mock_telemetry():
+    service = MagicMock(spec=OcrTelemetryService)
+    with patch("src.routes.telemetry.get_ocr_telemetry_service", return_value=service):
+        yield service
+
+
+def test_bulk_stats_endpoint(client, mock_telemetry):
+    mock_telemetry.get_city_ocr_stats_bulk.return_value = {
+        "sf": {"city_id": "sf", "total_ocr_attempts": 3},
+        "error": {"city_id": "error", "total_ocr_attempts": 0},
+    }
+
+    response = client.get("/telemetry/ocr/stats?city_id=sf&city_id=error")
+
+    assert response.status_code == 200
+    assert response.json()["statistics"]["error"]["total_ocr_attempts"] == 0
+    mock_telemetry.get_city_ocr_stats_bulk.assert_called_once_with(["sf", "error"])
+
+
+def test_bulk_stats_endpoint_query_failure(client, mock_telemetry):
+    mock_telemetry.get_city_ocr_stats_bulk.side_effect = RuntimeError("db down")
+
+    response = client.get("/telemetry/ocr/stats?city_id=sf")
+
+    assert response.status_code == 500
+    assert "db down" in response.json()["detail"]
+
+
+def test_bulk_stats_endpoint_requires_city(client, mock_telemetry):
+    response = client.get("/telemetry/ocr/stats")
+
+    assert response.status_code == 422
+    mock_telemetry.get_city_ocr_stats_bulk.assert_not_called()
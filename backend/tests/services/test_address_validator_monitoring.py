@@ -1,77 +1,84 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections import ChainMap
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, patch
 from backend.src.services.address_validator import AddressValidator, AddressValidationResult
 
-@pytest.fixture
-def mock_email_service():
-    with patch("backend.src.services.address_validator.get_email_service") as mock:
-        service = AsyncMock()
-        mock.return_value = service
-        yield service
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def address_validator():
-    # Mock settings and city registry to avoid external dependencies
-    with patch("backend.src.services.address_validator.settings") as mock_settings, \
-         patch("backend.src.services.address_validator.get_city_registry") as mock_registry:
-
+    # Mock settings and city registry to avoid external dependencies.
+    # Built once per module; reset_address_validator gives each test clean state.
+    with patch.multiple(
+        "backend.src.services.address_validator", settings=DEFAULT, get_city_registry=DEFAULT
+    ) as mocks:
+        mock_settings = mocks["settings"]
         mock_settings.deepseek_api_key = "dummy"
         mock_settings.deepseek_base_url = "http://dummy"
 
         # Create validator
         validator = AddressValidator(cities_dir="dummy_path")
 
-        # Mock methods to avoid actual scraping and file operations
-        validator._scrape_url = AsyncMock()
-        validator._extract_address_from_text = AsyncMock()
-        validator._get_stored_address_string = MagicMock(return_value="123 Main St")
-        validator.update_city_address = MagicMock(return_value=True)
-        validator._set_cached_scrape = MagicMock()
-        validator._get_cached_scrape = MagicMock(return_value=None) # Force scrape
-
-        # Add city to mapping to avoid "No URL mapping" error
-        from backend.src.services.address_validator import CITY_URL_MAPPING
-        CITY_URL_MAPPING["test-city"] = "http://test-city.gov"
-
-        yield validator
+        # Overlay the test city so a missing mapping doesn't short-circuit
+        # validation; writes land in the overlay and vanish on teardown
+        from backend.src.services import address_validator as av_module
+        url_mapping = ChainMap({"test-city": "http://test-city.gov"}, av_module.CITY_URL_MAPPING)
+        with patch.object(av_module, "CITY_URL_MAPPING", url_mapping):
+            yield validator
+
+@pytest.fixture(autouse=True)
+def scraped(address_validator, scrape_log):
+    """
+    HTML the stubbed scrape returns (None = failure); tests flip the value.
+
+    Every scrape is logged to scrape_log, the ScrapedPage history the
+    failure alert reads.
+    """
+    address_validator._scrape_cache.clear()
+    result = {"html": None}
+
+    async def _scrape_url(url, city_id):
+        scrape_log.record(city_id, "fail" if result["html"] is None else "success")
+        return result["html"], None
+
+    # Mock methods to avoid actual scraping and file operations
+    address_validator._scrape_url = _scrape_url
+    address_validator._extract_address_from_text = AsyncMock()
+    address_validator._get_stored_address_string = MagicMock(return_value="123 Main St")
+    address_validator.update_city_address = MagicMock(return_value=True)
+    address_validator._set_cached_scrape = MagicMock()
+    address_validator._get_cached_scrape = MagicMock(return_value=None) # Force scrape
+    return result
 
 @pytest.mark.asyncio
-async def test_scrape_success_resets_failure_count(address_validator, mock_email_service):
-    # Setup failure count
-    address_validator._failure_counts["test-city"] = 2
+async def test_scrape_success_breaks_failure_streak(address_validator, mock_email_service, scrape_log, scraped):
+    # Two earlier failures
+    scrape_log.record("test-city", "fail")
+    scrape_log.record("test-city", "fail")
 
     # Mock successful scrape
-    address_validator._scrape_url.return_value = "<html>Address</html>"
+    scraped["html"] = "<html>Address</html>"
     address_validator._extract_address_from_text.return_value = "123 Main St"
+    await address_validator.validate_address("test-city")
 
-    # Run validation
+    # A failure right after the success doesn't alert
+    scraped["html"] = None
     await address_validator.validate_address("test-city")
 
-    # Verify count reset
-    assert "test-city" not in address_validator._failure_counts
+    assert scrape_log.statuses("test-city") == ["fail", "fail", "success", "fail"]
+    mock_email_service.send_admin_alert.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_scrape_failure_increments_count(address_validator, mock_email_service):
-    # Mock failed scrape
-    address_validator._scrape_url.return_value = None
-
-    # Run validation
+async def test_scrape_failure_is_recorded(address_validator, mock_email_service, scrape_log):
     await address_validator.validate_address("test-city")
-
-    # Verify count incremented
-    assert address_validator._failure_counts["test-city"] == 1
-
-    # Run again
     await address_validator.validate_address("test-city")
-    assert address_validator._failure_counts["test-city"] == 2
 
-@pytest.mark.asyncio
-async def test_third_failure_triggers_alert(address_validator, mock_email_service):
-    # Setup failure count
-    address_validator._failure_counts["test-city"] = 2
+    assert scrape_log.statuses("test-city") == ["fail", "fail"]
+    mock_email_service.send_admin_alert.assert_not_called()
 
-    # Mock failed scrape
-    address_validator._scrape_url.return_value = None
+@pytest.mark.asyncio
+async def test_third_failure_triggers_alert(address_validator, mock_email_service, scrape_log):
+    # Two earlier failures
+    scrape_log.record("test-city", "fail")
+    scrape_log.record("test-city", "fail")
 
     # Run validation (3rd failure)
     await address_validator.validate_address("test-city")
@@ -81,25 +88,22 @@ async def test_third_failure_triggers_alert(address_validator, mock_email_servic
     args, kwargs = mock_email_service.send_admin_alert.call_args
     assert "Urgent: Address Scraping Failed for test-city" in args[0]
 
-    # Verify count reset after alert (as per implementation)
-    assert address_validator._failure_counts["test-city"] == 0
-
 @pytest.mark.asyncio
-async def test_failures_tracked_separately(address_validator, mock_email_service):
+async def test_failures_tracked_separately(address_validator, mock_email_service, scrape_log):
     # Add another city
     from backend.src.services.address_validator import CITY_URL_MAPPING
     CITY_URL_MAPPING["other-city"] = "http://other-city.gov"
-
-    # Mock failed scrape
-    address_validator._scrape_url.return_value = None
     address_validator._get_stored_address_string.return_value = "Address"
 
-    # Fail test-city
-    await address_validator.validate_address("test-city")
-    assert address_validator._failure_counts["test-city"] == 1
-    assert "other-city" not in address_validator._failure_counts
+    scrape_log.record("test-city", "fail")
+    scrape_log.record("test-city", "fail")
 
-    # Fail other-city
+    # Another city's failures don't complete test-city's streak
     await address_validator.validate_address("other-city")
-    assert address_validator._failure_counts["test-city"] == 1
-    assert address_validator._failure_counts["other-city"] == 1
+    mock_email_service.send_admin_alert.assert_not_called()
+
+    await address_validator.validate_address("test-city")
+    mock_email_service.send_admin_alert.assert_called_once()
+    args, kwargs = mock_email_service.send_admin_alert.call_args
+    assert "test-city" in args[0]
+    assert scrape_log.statuses("other-city") == ["fail"]
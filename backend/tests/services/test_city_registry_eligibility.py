@@ -94,6 +94,25 @@ def test_get_all_cities_filter(mock_city_registry):
     assert eligible_cities[0]["city_id"] == "eligible"
     assert eligible_cities[0]["is_eligible"] is True
 
+def test_get_all_cities_cached_until_configs_change(mock_city_registry):
+    mock_city_registry.city_configs = {"eligible": create_mock_city("eligible")}
+
+    first = mock_city_registry.get_all_cities(eligible_only=False)
+    # Callers get their own list; mutating it does not leak into the cache
+    first.append({"city_id": "bogus"})
+    assert len(mock_city_registry.get_all_cities(eligible_only=False)) == 1
+
+    # Registering a city in place rebuilds the list
+    mock_city_registry.register_city("poa", create_mock_city("poa", requires_poa=True))
+    assert len(mock_city_registry.get_all_cities(eligible_only=False)) == 2
+
+    # Replacing the configs (as a reload does) rebuilds the list
+    mock_city_registry.city_configs = {
+        "eligible": create_mock_city("eligible"),
+        "poa": create_mock_city("poa", requires_poa=True),
+    }
+    assert len(mock_city_registry.get_all_cities(eligible_only=False)) == 2
+
 def test_multiple_sections_eligibility(mock_city_registry):
     # City with one blocked section and one eligible section should be eligible
     city = CityConfiguration(
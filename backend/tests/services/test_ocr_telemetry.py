@@ -0,0 +1,82 @@
+import pytest
+from pathlib import Path
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+# Add backend directory to path so imports work
+backend_dir = str(Path(__file__).parents[2])
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+from src.services.ocr_telemetry import (
+    Base,
+    OcrTelemetryRecord,
+    OcrTelemetryService,
+)
+
+
+@pytest.fixture
+def telemetry_service():
+    service = OcrTelemetryService()
+    service._engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(service._engine)
+    return service
+
+
+def record(service, city_id, confidence, corrected=False, success=True):
+    service.record_ocr_event(
+        OcrTelemetryRecord(
+            city_id=city_id,
+            ocr_confidence=confidence,
+            user_corrected=corrected,
+            extraction_success=success,
+        )
+    )
+
+
+def test_bulk_stats_group_by_city(telemetry_service):
+    record(telemetry_service, "sf", 0.9)
+    record(telemetry_service, "sf", 0.5, corrected=True, success=False)
+    record(telemetry_service, "la", 0.8)
+
+    stats = telemetry_service.get_city_ocr_stats_bulk(["sf", "la", "nyc"])
+
+    assert stats["sf"] == {
+        "city_id": "sf",
+        "total_ocr_attempts": 2,
+        "avg_confidence": 0.7,
+        "correction_rate": 0.5,
+        "success_rate": 0.5,
+    }
+    assert stats["la"]["total_ocr_attempts"] == 1
+    assert stats["la"]["success_rate"] == 1.0
+
+
+def test_bulk_stats_zeroed_for_cities_without_rows(telemetry_service):
+    record(telemetry_service, "sf", 0.9)
+
+    stats = telemetry_service.get_city_ocr_stats_bulk(["nyc", "error"])
+
+    assert set(stats) == {"nyc", "error"}
+    for city_id, city_stats in stats.items():
+        assert city_stats == {
+            "city_id": city_id,
+            "total_ocr_attempts": 0,
+            "avg_confidence": 0,
+            "correction_rate": 0,
+            "success_rate": 0,
+        }
+
+
+def test_bulk_stats_raise_on_query_failure(telemetry_service):
+    Base.metadata.drop_all(telemetry_service._engine)
+
+    with pytest.raises(Exception):
+        telemetry_service.get_city_ocr_stats_bulk(["sf"])
+    assert "error" in telemetry_service.get_city_ocr_stats("sf")
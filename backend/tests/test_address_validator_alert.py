@@ -1,9 +1,10 @@
 import pytest
-from unittest.mock import MagicMock, AsyncMock, patch
+from collections import ChainMap
+from unittest.mock import MagicMock, patch
 from pathlib import Path
 from backend.src.services.address_validator import AddressValidator
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_city_registry():
     mock_registry = MagicMock()
     # Setup get_mail_address to return a valid address object
@@ -19,100 +20,95 @@ def mock_city_registry():
     mock_registry.get_mail_address.return_value = mock_address
     return mock_registry
 
-@pytest.fixture
-def mock_email_service():
-    mock_service = AsyncMock()
-    mock_service.send_admin_alert = AsyncMock(return_value=True)
-    return mock_service
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def address_validator(mock_city_registry):
     # Mocking get_city_registry inside AddressValidator
     with patch("backend.src.services.address_validator.get_city_registry", return_value=mock_city_registry):
         validator = AddressValidator(cities_dir=Path("/tmp/cities"))
 
-        # Override CITY_URL_MAPPING to include our test city
+        # Overlay our test city on the module mappings; the originals are
+        # never written to and come back untouched on teardown
         from backend.src.services import address_validator as av_module
-        av_module.CITY_URL_MAPPING["test-city"] = "http://test-city.com"
-        av_module.EXPECTED_ADDRESSES["test-city"] = "123 Main St, Test City, TS 12345"
-
-        yield validator
-
-        # Cleanup
-        if "test-city" in av_module.CITY_URL_MAPPING:
-            del av_module.CITY_URL_MAPPING["test-city"]
-        if "test-city" in av_module.EXPECTED_ADDRESSES:
-            del av_module.EXPECTED_ADDRESSES["test-city"]
+        with patch.multiple(
+            av_module,
+            CITY_URL_MAPPING=ChainMap({"test-city": "http://test-city.com"}, av_module.CITY_URL_MAPPING),
+            EXPECTED_ADDRESSES=ChainMap(
+                {"test-city": "123 Main St, Test City, TS 12345"}, av_module.EXPECTED_ADDRESSES
+            ),
+        ):
+            yield validator
+
+@pytest.fixture(autouse=True)
+def scrape_results(address_validator, scrape_log):
+    """
+    Results the stubbed scrape/extract steps return; tests flip the values.
+
+    The validator is shared across the module, so each test starts from a
+    clean scrape cache and failing scrapes. Every scrape is logged to
+    scrape_log, the ScrapedPage history the failure alert reads.
+    """
+    address_validator._scrape_cache.clear()
+    results = {"scrape": None, "extract": None}
+
+    async def _scrape_url(url, city_id):
+        scrape_log.record(city_id, "fail" if results["scrape"] is None else "success")
+        return results["scrape"], None
+
+    async def _extract_address_from_text(*args, **kwargs):
+        return results["extract"]
+
+    address_validator._scrape_url = _scrape_url
+    address_validator._extract_address_from_text = _extract_address_from_text
+    return results
 
 @pytest.mark.asyncio
-async def test_alert_on_consecutive_failures(address_validator, mock_email_service):
+async def test_alert_on_consecutive_failures(address_validator, mock_email_service, scrape_log):
     """Test that admin alert is sent after 3 consecutive scraping failures."""
 
     city_id = "test-city"
 
-    # Mock _scrape_url to fail
-    address_validator._scrape_url = AsyncMock(return_value=None)
-
-    # Mock get_email_service to return our mock service
-    with patch("backend.src.services.address_validator.get_email_service", return_value=mock_email_service):
-
-        # 1st Failure
-        await address_validator.validate_address(city_id)
-        assert address_validator._failure_counts[city_id] == 1
-        mock_email_service.send_admin_alert.assert_not_called()
+    # 1st and 2nd failures stay below the threshold
+    await address_validator.validate_address(city_id)
+    await address_validator.validate_address(city_id)
+    assert scrape_log.statuses(city_id) == ["fail", "fail"]
+    mock_email_service.send_admin_alert.assert_not_called()
 
-        # 2nd Failure
-        await address_validator.validate_address(city_id)
-        assert address_validator._failure_counts[city_id] == 2
-        mock_email_service.send_admin_alert.assert_not_called()
+    # 3rd Failure - Should trigger alert
+    await address_validator.validate_address(city_id)
+    mock_email_service.send_admin_alert.assert_called_once()
 
-        # 3rd Failure - Should trigger alert
-        await address_validator.validate_address(city_id)
-        # Count resets to 0 after alert
-        assert address_validator._failure_counts[city_id] == 0
-        mock_email_service.send_admin_alert.assert_called_once()
+    # Check call arguments
+    args, kwargs = mock_email_service.send_admin_alert.call_args
+    # Implementation uses positional args: subject, message
+    message = args[1]
+    assert "Address scraping has failed 3 times" in message
 
-        # Check call arguments
-        args, kwargs = mock_email_service.send_admin_alert.call_args
-        # Implementation uses positional args: subject, message
-        message = args[1]
-        assert "Address scraping has failed 3 times" in message
-
-        # 4th Failure - Should count as 1
-        mock_email_service.send_admin_alert.reset_mock()
-        await address_validator.validate_address(city_id)
-        assert address_validator._failure_counts[city_id] == 1
-        mock_email_service.send_admin_alert.assert_not_called()
+    # 4th Failure - the last three scrapes are still all failures
+    mock_email_service.send_admin_alert.reset_mock()
+    await address_validator.validate_address(city_id)
+    mock_email_service.send_admin_alert.assert_called_once()
 
 @pytest.mark.asyncio
-async def test_reset_count_on_success(address_validator, mock_email_service):
-    """Test that failure count resets on success."""
+async def test_success_breaks_failure_streak(address_validator, mock_email_service, scrape_results, scrape_log):
+    """Test that a successful scrape breaks the run of failures."""
 
     city_id = "test-city"
 
-    # Mock _scrape_url to fail initially
-    address_validator._scrape_url = AsyncMock(return_value=None)
-
-    with patch("backend.src.services.address_validator.get_email_service", return_value=mock_email_service):
-        # 2 Failures
-        await address_validator.validate_address(city_id)
-        await address_validator.validate_address(city_id)
-        assert address_validator._failure_counts[city_id] == 2
-
-        # Success
-        # We need _scrape_url to return text, and _extract_address_from_text to return address
-        address_validator._scrape_url = AsyncMock(return_value="Valid content")
-        address_validator._extract_address_from_text = AsyncMock(return_value="123 Main St, Test City, TS 12345")
-
-        await address_validator.validate_address(city_id)
+    # 2 Failures
+    await address_validator.validate_address(city_id)
+    await address_validator.validate_address(city_id)
 
-        # Count should be reset (key removed)
-        assert city_id not in address_validator._failure_counts
+    # Success
+    # We need _scrape_url to return text, and _extract_address_from_text to return address
+    scrape_results["scrape"] = "Valid content"
+    scrape_results["extract"] = "123 Main St, Test City, TS 12345"
+    await address_validator.validate_address(city_id)
 
-        # Clear cache to force scraping again
-        address_validator._scrape_cache = {}
+    # Clear cache to force scraping again
+    address_validator._scrape_cache.clear()
 
-        # Fail again
-        address_validator._scrape_url = AsyncMock(return_value=None)
-        await address_validator.validate_address(city_id)
-        assert address_validator._failure_counts[city_id] == 1
+    # Fail again: the last three scrapes are fail, success, fail
+    scrape_results["scrape"] = None
+    await address_validator.validate_address(city_id)
+    assert scrape_log.statuses(city_id) == ["fail", "fail", "success", "fail"]
+    mock_email_service.send_admin_alert.assert_not_called()
@@ -1,19 +1,18 @@
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch, mock_open
+from unittest.mock import patch, mock_open
 import os
 import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import Any, List, Optional
 
 # Add backend to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.app import app
-from src.models import Intake, Draft, Payment, PaymentStatus
+from src.models import PaymentStatus
 from src.routes.admin import limiter
 
-client = TestClient(app)
-
 @pytest.fixture(autouse=True)
 def disable_rate_limiting():
     """Disable rate limiting for all tests in this module."""
@@ -21,12 +20,93 @@ def disable_rate_limiting():
     yield
     limiter.enabled = True
 
+# --- Fake DB ---
+
+@dataclass
+class FakePayment:
+    status: Optional[PaymentStatus] = None
+    amount_total: Optional[int] = None
+    lob_tracking_id: Optional[str] = None
+    lob_mail_type: Optional[str] = None
+    is_fulfilled: bool = False
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+@dataclass
+class FakeDraft:
+    draft_text: str
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+@dataclass
+class FakeIntake:
+    id: int
+    citation_number: str
+    status: str
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    user_name: str = ""
+    user_email: Optional[str] = None
+    user_phone: Optional[str] = None
+    user_address_line1: str = ""
+    user_address_line2: Optional[str] = None
+    user_city: str = ""
+    user_state: str = ""
+    user_zip: str = ""
+    violation_date: Optional[str] = None
+    vehicle_info: Optional[str] = None
+    payments: List[FakePayment] = field(default_factory=list)
+    drafts: List[FakeDraft] = field(default_factory=list)
+
+@dataclass
+class FakeQuery:
+    """Query stand-in: chain methods return self, terminals return canned results."""
+
+    rows: List[Any] = field(default_factory=list)
+    scalars: List[int] = field(default_factory=list)
+
+    def options(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def order_by(self, *args):
+        return self
+
+    def limit(self, *args):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def scalar(self):
+        return self.scalars.pop(0) if self.scalars else 0
+
+@dataclass
+class FakeSession:
+    query_result: FakeQuery = field(default_factory=FakeQuery)
+
+    def query(self, *args):
+        return self.query_result
+
+@dataclass
+class FakeDbService:
+    session: FakeSession = field(default_factory=FakeSession)
+    healthy: bool = True
+
+    def health_check(self) -> bool:
+        return self.healthy
+
+    @contextmanager
+    def get_session(self):
+        yield self.session
+
 @pytest.fixture
 def mock_db_service():
-    with patch("src.routes.admin.get_db_service") as mock:
-        service_mock = MagicMock()
-        mock.return_value = service_mock
-        yield service_mock
+    service = FakeDbService()
+    with patch("src.routes.admin.get_db_service", return_value=service):
+        yield service
 
 @pytest.fixture
 def mock_env_secret():
@@ -40,67 +120,45 @@ def mock_env_allowed_ips():
 
 # --- Auth Tests ---
 
-def test_admin_auth_missing_header(mock_env_secret):
-    response = client.get("/admin/stats")
-    assert response.status_code == 401  # Unauthorized (both header and cookie missing)
-
-def test_admin_auth_invalid_header(mock_env_secret):
-    response = client.get("/admin/stats", headers={"X-Admin-Secret": "wrong"})
-    assert response.status_code == 401
-    assert response.json()["detail"] == "Invalid admin secret"
-
-def test_admin_auth_no_env_var():
-    # We need to ensure ADMIN_SECRET is not set.
-    # We can use patch.dict to remove it.
-    with patch.dict(os.environ):
-        if "ADMIN_SECRET" in os.environ:
-            del os.environ["ADMIN_SECRET"]
-        response = client.get("/admin/stats", headers={"X-Admin-Secret": "secret123"})
-        assert response.status_code == 503
-        assert "not configured" in response.json()["detail"]
-
-def test_admin_auth_success(mock_env_secret, mock_db_service):
-    # Mock DB health check to avoid 503 from endpoint logic
-    mock_db_service.health_check.return_value = True
-    # Mock session
-    session_mock = MagicMock()
-    mock_db_service.get_session.return_value.__enter__.return_value = session_mock
-    # Mock query results to return 0/empty
-    session_mock.query.return_value.scalar.return_value = 0
-
+@pytest.mark.parametrize(
+    "env,headers,status,detail_sub",
+    [
+        ({"ADMIN_SECRET": "secret123"}, {}, 401, None),
+        ({"ADMIN_SECRET": "secret123"}, {"X-Admin-Secret": "wrong"}, 401, "Invalid admin secret"),
+        ({}, {"X-Admin-Secret": "secret123"}, 503, "not configured"),
+        (
+            {"ADMIN_SECRET": "secret123", "ADMIN_ALLOWED_IPS": "10.0.0.1"},
+            {"X-Admin-Secret": "secret123"},
+            403,
+            "IP not authorized",
+        ),
+    ],
+    ids=["missing", "invalid", "unconfigured", "ip-forbidden"],
+)
+def test_admin_auth_rejected(client, monkeypatch, env, headers, status, detail_sub):
+    monkeypatch.delenv("ADMIN_SECRET", raising=False)
+    monkeypatch.delenv("ADMIN_ALLOWED_IPS", raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+
+    response = client.get("/admin/stats", headers=headers)
+    assert response.status_code == status
+    assert detail_sub is None or detail_sub in response.json()["detail"]
+
+def test_admin_auth_success(client, mock_env_secret, mock_db_service):
     response = client.get("/admin/stats", headers={"X-Admin-Secret": "secret123"})
     assert response.status_code == 200
 
-def test_admin_auth_ip_allowed(mock_env_allowed_ips, mock_db_service):
-    mock_db_service.health_check.return_value = True
-    session_mock = MagicMock()
-    mock_db_service.get_session.return_value.__enter__.return_value = session_mock
-    session_mock.query.return_value.scalar.return_value = 0
-
+def test_admin_auth_ip_allowed(client, mock_env_allowed_ips, mock_db_service):
     # TestClient usually sends requests from 'testclient' hostname
     # We added 'testclient' to allowed IPs in the fixture
     response = client.get("/admin/stats", headers={"X-Admin-Secret": "secret123"})
     assert response.status_code == 200
 
-def test_admin_auth_ip_forbidden(mock_env_allowed_ips):
-    # "testclient" IS in the allowed list for the fixture above.
-    # Let's override it to something else where "testclient" is NOT allowed.
-    with patch.dict(os.environ, {"ADMIN_SECRET": "secret123", "ADMIN_ALLOWED_IPS": "10.0.0.1"}):
-        response = client.get("/admin/stats", headers={"X-Admin-Secret": "secret123"})
-        assert response.status_code == 403
-        assert "IP not authorized" in response.json()["detail"]
-
 # --- Endpoint Tests ---
 
-def test_get_system_stats(mock_env_secret, mock_db_service):
-    mock_db_service.health_check.return_value = True
-    session_mock = MagicMock()
-    mock_db_service.get_session.return_value.__enter__.return_value = session_mock
-
-    # Configure scalars for query chain
-    query_mock = session_mock.query.return_value
-    query_mock.filter.return_value = query_mock
-    query_mock.scalar.side_effect = [10, 5, 8, 3, 5]
+def test_get_system_stats(client, mock_env_secret, mock_db_service):
+    mock_db_service.session.query_result.scalars = [10, 5, 8, 3, 5]
 
     response = client.get("/admin/stats", headers={"X-Admin-Secret": "secret123"})
     assert response.status_code == 200
@@ -112,29 +170,14 @@ def test_get_system_stats(mock_env_secret, mock_db_service):
     assert data["fulfilled_count"] == 5
     assert data["db_status"] == "connected"
 
-def test_get_recent_activity(mock_env_secret, mock_db_service):
-    mock_db_service.health_check.return_value = True
-    session_mock = MagicMock()
-    mock_db_service.get_session.return_value.__enter__.return_value = session_mock
-
-    # Mock Intakes
-    mock_intake = MagicMock(spec=Intake)
-    mock_intake.id = 1
-    mock_intake.created_at = datetime.now(timezone.utc)
-    mock_intake.citation_number = "CIT123"
-    mock_intake.status = "submitted"
-
-    # Mock payment on intake
-    mock_payment = MagicMock(spec=Payment)
-    mock_payment.status = PaymentStatus.PAID
-    mock_payment.amount_total = 1000
-    mock_payment.lob_tracking_id = "TRACK123"
-
-    mock_intake.payments = [mock_payment]
-
-    # Mock query chain
-    query_mock = session_mock.query.return_value
-    query_mock.options.return_value.order_by.return_value.limit.return_value.all.return_value = [mock_intake]
+def test_get_recent_activity(client, mock_env_secret, mock_db_service):
+    payment = FakePayment(
+        status=PaymentStatus.PAID, amount_total=1000, lob_tracking_id="TRACK123"
+    )
+    intake = FakeIntake(
+        id=1, citation_number="CIT123", status="submitted", payments=[payment]
+    )
+    mock_db_service.session.query_result.rows = [intake]
 
     response = client.get("/admin/activity", headers={"X-Admin-Secret": "secret123"})
     assert response.status_code == 200
@@ -145,44 +188,32 @@ def test_get_recent_activity(mock_env_secret, mock_db_service):
     assert data[0]["amount"] == 10.0  # 1000 / 100
     assert data[0]["lob_tracking_id"] == "TRACK123"
 
-def test_get_intake_detail(mock_env_secret, mock_db_service):
-    mock_db_service.health_check.return_value = True
-    session_mock = MagicMock()
-    mock_db_service.get_session.return_value.__enter__.return_value = session_mock
-
-    mock_intake = MagicMock(spec=Intake)
-    mock_intake.id = 1
-    mock_intake.created_at = datetime.now(timezone.utc)
-    mock_intake.citation_number = "CIT123"
-    mock_intake.status = "submitted"
-    mock_intake.user_name = "John Doe"
-    mock_intake.user_email = "john@example.com"
-    mock_intake.user_phone = "555-1234"
-    mock_intake.user_address_line1 = "123 Main St"
-    mock_intake.user_address_line2 = None
-    mock_intake.user_city = "City"
-    mock_intake.user_state = "ST"
-    mock_intake.user_zip = "12345"
-    mock_intake.violation_date = "2023-01-01"
-    mock_intake.vehicle_info = "Car"
-
-    # Mock Drafts
-    mock_draft = MagicMock(spec=Draft)
-    mock_draft.created_at = datetime.now(timezone.utc)
-    mock_draft.draft_text = "Dear Sir/Madam..."
-    mock_intake.drafts = [mock_draft]
-
-    # Mock Payments
-    mock_payment = MagicMock(spec=Payment)
-    mock_payment.created_at = datetime.now(timezone.utc)
-    mock_payment.status = PaymentStatus.PAID
-    mock_payment.amount_total = 5000
-    mock_payment.lob_tracking_id = "TRACK456"
-    mock_payment.lob_mail_type = "certified"
-    mock_payment.is_fulfilled = True
-    mock_intake.payments = [mock_payment]
-
-    session_mock.query.return_value.options.return_value.filter.return_value.first.return_value = mock_intake
+def test_get_intake_detail(client, mock_env_secret, mock_db_service):
+    intake = FakeIntake(
+        id=1,
+        citation_number="CIT123",
+        status="submitted",
+        user_name="John Doe",
+        user_email="john@example.com",
+        user_phone="555-1234",
+        user_address_line1="123 Main St",
+        user_city="City",
+        user_state="ST",
+        user_zip="12345",
+        violation_date="2023-01-01",
+        vehicle_info="Car",
+        drafts=[FakeDraft(draft_text="Dear Sir/Madam...")],
+        payments=[
+            FakePayment(
+                status=PaymentStatus.PAID,
+                amount_total=5000,
+                lob_tracking_id="TRACK456",
+                lob_mail_type="certified",
+                is_fulfilled=True,
+            )
+        ],
+    )
+    mock_db_service.session.query_result.rows = [intake]
 
     response = client.get("/admin/intake/1", headers={"X-Admin-Secret": "secret123"})
     assert response.status_code == 200
@@ -193,19 +224,14 @@ def test_get_intake_detail(mock_env_secret, mock_db_service):
     assert data["amount_total"] == 50.0
     assert data["is_fulfilled"] == True
 
-def test_get_intake_detail_not_found(mock_env_secret, mock_db_service):
-    mock_db_service.health_check.return_value = True
-    session_mock = MagicMock()
-    mock_db_service.get_session.return_value.__enter__.return_value = session_mock
-    session_mock.query.return_value.options.return_value.filter.return_value.first.return_value = None
-
+def test_get_intake_detail_not_found(client, mock_env_secret, mock_db_service):
     response = client.get("/admin/intake/999", headers={"X-Admin-Secret": "secret123"})
     assert response.status_code == 404
     # 404 is handled by custom handler in app.py which maps 'detail' to 'message'
     # The default 404 handler returns generic message
     assert response.json()["message"] == "The requested resource was not found"
 
-def test_get_server_logs(mock_env_secret):
+def test_get_server_logs(client, mock_env_secret):
     # Mock os.path.exists and open
     with patch("os.path.exists") as mock_exists:
         mock_exists.return_value = True
@@ -214,7 +240,7 @@ def test_get_server_logs(mock_env_secret):
             assert response.status_code == 200
             assert response.json()["logs"] == "log line 1\nlog line 2\n"
 
-def test_get_server_logs_not_found(mock_env_secret):
+def test_get_server_logs_not_found(client, mock_env_secret):
     with patch("os.path.exists") as mock_exists:
         mock_exists.return_value = False
         response = client.get("/admin/logs", headers={"X-Admin-Secret": "secret123"})
@@ -5,6 +5,7 @@ Tests for AppealStorage service.
 import sys
 import os
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock
 import pytest
 
@@ -13,24 +14,33 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 from src.services.appeal_storage import AppealStorage, AppealData, get_appeal_storage
 
-@pytest.fixture
-def storage():
-    """Fixture for a fresh AppealStorage instance."""
+@pytest.fixture(scope="module")
+def _shared_storage():
     return AppealStorage(ttl_hours=1)
 
-def test_store_appeal_sets_timestamp(storage):
+@pytest.fixture
+def storage(_shared_storage):
+    """Fixture for an empty AppealStorage, reused across the module."""
+    _shared_storage._storage.clear()
+    return _shared_storage
+
+@pytest.fixture(scope="module")
+def appeal_kwargs():
+    """Shared store_appeal arguments; read-only, so tests override by copying."""
+    return MappingProxyType({
+        "violation_date": "2023-01-01",
+        "vehicle_info": "Test Car",
+        "user_name": "John Doe",
+        "user_address": "123 Main St",
+        "user_city": "Test City",
+        "user_state": "CA",
+        "user_zip": "12345",
+        "appeal_letter_text": "Test appeal",
+    })
+
+def test_store_appeal_sets_timestamp(storage, appeal_kwargs):
     """Test that store_appeal sets the created_at timestamp."""
-    key = storage.store_appeal(
-        citation_number="TEST-123",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="John Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
-    )
+    key = storage.store_appeal(citation_number="TEST-123", **appeal_kwargs)
 
     appeal = storage.get_appeal(key)
     assert appeal is not None
@@ -42,19 +52,9 @@ def test_store_appeal_sets_timestamp(storage):
     except ValueError:
         pytest.fail(f"created_at '{appeal.created_at}' is not a valid ISO format")
 
-def test_cleanup_does_not_delete_fresh_appeal(storage):
+def test_cleanup_does_not_delete_fresh_appeal(storage, appeal_kwargs):
     """Test that cleanup_expired does not delete a freshly created appeal."""
-    key = storage.store_appeal(
-        citation_number="TEST-CLEANUP",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="John Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
-    )
+    key = storage.store_appeal(citation_number="TEST-CLEANUP", **appeal_kwargs)
 
     # Run cleanup immediately
     removed_count = storage.cleanup_expired()
@@ -98,24 +98,23 @@ def test_store_appeal_success(storage):
     assert appeal.selected_photo_ids == ["photo1", "photo2"]
     assert appeal.appeal_type == "certified"
 
-def test_get_appeal_not_found(storage):
-    """Test getting a non-existent appeal."""
-    assert storage.get_appeal("non-existent-key") is None
-
-def test_get_appeal_expired(storage):
+@pytest.mark.parametrize(
+    "method,args,expected",
+    [
+        ("get_appeal", (), None),
+        ("delete_appeal", (), False),
+        ("update_payment_status", ("sess_123", "paid"), False),
+    ],
+    ids=["get", "delete", "update-payment"],
+)
+def test_missing_key(storage, method, args, expected):
+    """Test lookups against a key that was never stored."""
+    assert getattr(storage, method)("missing-key", *args) is expected
+
+def test_get_appeal_expired(storage, appeal_kwargs):
     """Test getting an expired appeal."""
     # Store an appeal
-    key = storage.store_appeal(
-        citation_number="TEST-EXPIRED",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="John Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
-    )
+    key = storage.store_appeal(citation_number="TEST-EXPIRED", **appeal_kwargs)
 
     # Manually backdate the created_at to simulate expiration
     # We have to access the internal storage because we can't control store_appeal's time without extensive mocking
@@ -130,19 +129,9 @@ def test_get_appeal_expired(storage):
     # Should be removed from storage
     assert key not in storage._storage
 
-def test_update_payment_status(storage):
+def test_update_payment_status(storage, appeal_kwargs):
     """Test updating payment status."""
-    key = storage.store_appeal(
-        citation_number="TEST-PAYMENT",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="John Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
-    )
+    key = storage.store_appeal(citation_number="TEST-PAYMENT", **appeal_kwargs)
 
     success = storage.update_payment_status(key, "sess_123", "paid")
     assert success is True
@@ -151,80 +140,29 @@ def test_update_payment_status(storage):
     assert appeal.payment_status == "paid"
     assert appeal.stripe_session_id == "sess_123"
 
-def test_update_payment_status_not_found(storage):
-    """Test updating payment status for non-existent key."""
-    success = storage.update_payment_status("missing-key", "sess_123", "paid")
-    assert success is False
-
-def test_delete_appeal(storage):
+def test_delete_appeal(storage, appeal_kwargs):
     """Test deleting an appeal."""
-    key = storage.store_appeal(
-        citation_number="TEST-DELETE",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="John Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
-    )
+    key = storage.store_appeal(citation_number="TEST-DELETE", **appeal_kwargs)
 
     assert storage.delete_appeal(key) is True
     assert storage.get_appeal(key) is None
     assert storage.delete_appeal(key) is False
 
-def test_get_all_appeals(storage):
+def test_get_all_appeals(storage, appeal_kwargs):
     """Test getting all appeals."""
+    storage.store_appeal(citation_number="TEST-ALL-1", **appeal_kwargs)
     storage.store_appeal(
-        citation_number="TEST-ALL-1",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="John Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
-    )
-    storage.store_appeal(
-        citation_number="TEST-ALL-2",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="Jane Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
+        citation_number="TEST-ALL-2", **{**appeal_kwargs, "user_name": "Jane Doe"}
     )
 
     appeals = storage.get_all_appeals()
     assert len(appeals) == 2
 
-def test_get_stats(storage):
+def test_get_stats(storage, appeal_kwargs):
     """Test getting stats."""
-    k1 = storage.store_appeal(
-        citation_number="TEST-STATS-1",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="John Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
-    )
+    k1 = storage.store_appeal(citation_number="TEST-STATS-1", **appeal_kwargs)
     k2 = storage.store_appeal(
-        citation_number="TEST-STATS-2",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="Jane Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
+        citation_number="TEST-STATS-2", **{**appeal_kwargs, "user_name": "Jane Doe"}
     )
 
     storage.update_payment_status(k1, "sess_1", "paid")
@@ -235,33 +173,13 @@ def test_get_stats(storage):
     assert stats["pending"] == 1
     assert len(stats["storage_keys"]) == 2
 
-def test_cleanup_expired(storage):
+def test_cleanup_expired(storage, appeal_kwargs):
     """Test cleaning up expired appeals."""
     # 1. Fresh appeal (should stay)
-    k1 = storage.store_appeal(
-        citation_number="TEST-FRESH",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="John Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
-    )
+    k1 = storage.store_appeal(citation_number="TEST-FRESH", **appeal_kwargs)
 
     # 2. Expired appeal (should go)
-    k2 = storage.store_appeal(
-        citation_number="TEST-OLD",
-        violation_date="2023-01-01",
-        vehicle_info="Test Car",
-        user_name="John Doe",
-        user_address="123 Main St",
-        user_city="Test City",
-        user_state="CA",
-        user_zip="12345",
-        appeal_letter_text="Test appeal"
-    )
+    k2 = storage.store_appeal(citation_number="TEST-OLD", **appeal_kwargs)
     storage._storage[k2].created_at = (datetime.now() - timedelta(hours=2)).isoformat()
 
     # 3. Run cleanup
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models import AppealType, PaymentStatus
+from src.services.database import DatabaseService
+
+
+@pytest.fixture
+def db_service(tmp_path):
+    service = DatabaseService(database_url=f"sqlite:///{tmp_path / 'fightcity.db'}")
+    service.create_tables()
+    yield service
+    service.engine.dispose()
+
+
+@pytest.fixture
+def payment(db_service):
+    intake = db_service.create_intake(
+        citation_number="912345678",
+        user_name="Jane Doe",
+        user_address_line1="1 Market St",
+        user_city="San Francisco",
+        user_state="CA",
+        user_zip="94105",
+    )
+    return db_service.create_payment(
+        intake_id=intake.id,
+        stripe_session_id="cs_test_state",
+        amount_total=1999,
+        appeal_type=AppealType.STANDARD,
+    )
+
+
+def test_advance_payment_state_applies_matching_transition(db_service, payment):
+    updated = db_service.advance_payment_state(
+        "cs_test_state",
+        PaymentStatus.PAID,
+        from_state=PaymentStatus.PENDING,
+        receipt_url="https://pay.stripe.com/receipts/test",
+    )
+
+    stored = db_service.get_payment_by_session("cs_test_state")
+    assert updated is True
+    assert stored.status == PaymentStatus.PAID
+    assert stored.receipt_url == "https://pay.stripe.com/receipts/test"
+
+
+def test_advance_payment_state_from_state_mismatch_leaves_row(db_service, payment):
+    updated = db_service.advance_payment_state(
+        "cs_test_state",
+        PaymentStatus.PAID,
+        from_state=PaymentStatus.PAID,
+        is_fulfilled=True,
+        lob_tracking_id="LOB_123",
+    )
+
+    stored = db_service.get_payment_by_session("cs_test_state")
+    assert updated is False
+    assert stored.status == PaymentStatus.PENDING
+    assert not stored.is_fulfilled
+    assert stored.lob_tracking_id is None
+
+
+def test_advance_payment_state_unknown_session(db_service, payment):
+    assert db_service.advance_payment_state("cs_missing", PaymentStatus.PAID) is False
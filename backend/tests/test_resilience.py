@@ -80,6 +80,17 @@ async def test_circuit_open_behavior(circuit_breaker):
     with pytest.raises(CircuitOpenError):
         await circuit_breaker.call(success_func)
 
+def test_is_open(circuit_breaker):
+    """Verify is_open reports OPEN only until the cooldown elapses."""
+    assert circuit_breaker.is_open() is False
+
+    circuit_breaker.metrics.state = CircuitState.OPEN
+    circuit_breaker.metrics.last_failure_time = time.time()
+    assert circuit_breaker.is_open() is True
+
+    circuit_breaker.metrics.last_failure_time = time.time() - 2
+    assert circuit_breaker.is_open() is False
+
 @pytest.mark.asyncio
 async def test_half_open_transition(circuit_breaker):
     """Verify transition to HALF_OPEN after timeout."""
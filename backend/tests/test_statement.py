@@ -0,0 +1,278 @@
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import orjson
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.services.statement import (
+    _REFINEMENT_CACHE,
+    REFINEMENT_CACHE_TTL,
+    DeepSeekService,
+    StatementRefinementRequest,
+    StatementRefinementResponse,
+)
+
+LETTER = [
+    "I respectfully request that citation 912345678 be dismissed. ",
+    "The posted signage was obscured by tree branches at the time.",
+]
+
+
+class FakeStreamResponse:
+    """Streaming response stand-in that replays server-sent event lines."""
+
+    def __init__(self, status_code=200, lines=(), stall=False):
+        self._response = httpx.Response(
+            status_code, request=httpx.Request("POST", DeepSeekService.API_URL)
+        )
+        self.status_code = status_code
+        self.is_error = self._response.is_error
+        self._lines = lines
+        self._stall = stall
+
+    def raise_for_status(self):
+        return self._response.raise_for_status()
+
+    async def aiter_lines(self):
+        if self._stall:
+            await asyncio.sleep(3600)
+        for line in self._lines:
+            yield line
+
+
+def sse(content):
+    return "data: " + orjson.dumps({"choices": [{"delta": {"content": content}}]}).decode()
+
+
+def stream_client(*responses):
+    """A client whose stream() yields the given responses in order."""
+    replies = iter(responses)
+
+    @asynccontextmanager
+    async def stream(method, url, **kwargs):
+        yield next(replies)
+
+    client = MagicMock()
+    client.stream = MagicMock(side_effect=stream)
+    return client
+
+
+@pytest.fixture
+def service():
+    _REFINEMENT_CACHE.clear()
+    yield DeepSeekService(api_key="test-key")
+    _REFINEMENT_CACHE.clear()
+
+
+def refined(request, status="completed"):
+    return StatementRefinementResponse(
+        refined_text="".join(LETTER),
+        original_text=request.appeal_reason,
+        citation_number=request.citation_number,
+        processing_time_ms=5,
+        status=status,
+        fallback_used=status == "fallback",
+    )
+
+
+@pytest.fixture
+def refinement_request():
+    return StatementRefinementRequest(
+        citation_number="912345678",
+        appeal_reason="the sign was hidden by a tree",
+        city_id="sf",
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_assembles_data_chunks(service, refinement_request):
+    """Content deltas are joined in order and reading stops at [DONE]."""
+    lines = [
+        ": keep-alive",
+        "data: " + orjson.dumps({"choices": [{"delta": {"role": "assistant"}}]}).decode(),
+        sse(LETTER[0]),
+        "",
+        sse(LETTER[1]),
+        "data: [DONE]",
+        "data: {never parsed",
+    ]
+    client = stream_client(FakeStreamResponse(lines=lines))
+
+    with patch("src.services.statement._get_client", return_value=client):
+        result = await service._refine_with_retries(refinement_request)
+
+    assert result.status == "completed"
+    assert result.refined_text == "".join(LETTER).strip()
+    assert orjson.loads(client.stream.call_args.kwargs["content"])["stream"] is True
+    assert service._circuit_breaker.metrics.failure_count == 0
+
+
+@pytest.mark.asyncio
+async def test_stalled_first_token_times_out_and_trips_breaker(service, refinement_request):
+    """No content within FIRST_TOKEN_TIMEOUT is a ReadTimeout counted by the breaker."""
+    service.FIRST_TOKEN_TIMEOUT = 0.01
+    client = stream_client(FakeStreamResponse(stall=True))
+
+    with patch("src.services.statement._get_client", return_value=client):
+        with pytest.raises(httpx.ReadTimeout):
+            await service._stream_completion(b"{}")
+
+    client = stream_client(FakeStreamResponse(stall=True))
+    service.RETRY_COUNT = 1
+    with patch("src.services.statement._get_client", return_value=client):
+        result = await service._refine_with_retries(refinement_request)
+
+    assert result.fallback_used is True
+    assert service._circuit_breaker.metrics.failure_count == 1
+
+
+@pytest.mark.asyncio
+async def test_client_error_does_not_trip_breaker(service, refinement_request):
+    """A 4xx falls back immediately without retrying or counting a failure."""
+    client = stream_client(FakeStreamResponse(status_code=401))
+
+    with patch("src.services.statement._get_client", return_value=client):
+        result = await service._refine_with_retries(refinement_request)
+
+    assert result.fallback_used is True
+    assert client.stream.call_count == 1
+    assert service._circuit_breaker.metrics.failure_count == 0
+
+
+@pytest.mark.asyncio
+async def test_malformed_chunk_falls_back_without_tripping_breaker(service, refinement_request):
+    """A chunk that fails to parse ends the stream in a local fallback."""
+    lines = [sse(LETTER[0]), "data: {not json"]
+    client = stream_client(FakeStreamResponse(lines=lines))
+
+    with patch("src.services.statement._get_client", return_value=client):
+        result = await service._refine_with_retries(refinement_request)
+
+    assert result.fallback_used is True
+    assert client.stream.call_count == 1
+    assert service._circuit_breaker.metrics.failure_count == 0
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_requests_share_one_call(service, refinement_request):
+    """Concurrent duplicates coalesce onto one upstream call but get their own copies."""
+    gate = asyncio.Event()
+    calls = []
+
+    async def refine(request):
+        calls.append(request)
+        await gate.wait()
+        return refined(request)
+
+    with patch.object(service, "_refine_with_retries", side_effect=refine):
+        first = asyncio.create_task(service.refine_statement_async(refinement_request))
+        second = asyncio.create_task(service.refine_statement_async(refinement_request))
+        await asyncio.sleep(0)
+        gate.set()
+        a, b = await asyncio.gather(first, second)
+
+    assert len(calls) == 1
+    assert a == b
+    assert a is not b
+    a.refined_text = "edited by the first caller"
+    assert b.refined_text == "".join(LETTER)
+    assert not service._inflight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call(service, refinement_request):
+    """A caller that disconnects leaves the coalesced call running for the other."""
+    gate = asyncio.Event()
+    calls = []
+
+    async def refine(request):
+        calls.append(request)
+        await gate.wait()
+        return refined(request)
+
+    with patch.object(service, "_refine_with_retries", side_effect=refine):
+        first = asyncio.create_task(service.refine_statement_async(refinement_request))
+        second = asyncio.create_task(service.refine_statement_async(refinement_request))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        result = await second
+
+    assert first.cancelled()
+    assert len(calls) == 1
+    assert result.refined_text == "".join(LETTER)
+
+
+@pytest.mark.asyncio
+async def test_refinement_cache_hit_returns_copy(service, refinement_request):
+    """A repeat request is served from the cache as a fresh copy."""
+    upstream = AsyncMock(side_effect=refined)
+
+    with patch.object(service, "_refine_with_retries", upstream):
+        first = await service.refine_statement_async(refinement_request)
+        first.refined_text = "edited by the first caller"
+        second = await service.refine_statement_async(refinement_request)
+
+    assert upstream.await_count == 1
+    assert second.refined_text == "".join(LETTER)
+    assert len(_REFINEMENT_CACHE) == 1
+
+
+@pytest.mark.asyncio
+async def test_refinement_cache_entries_expire(service, refinement_request):
+    """Entries older than REFINEMENT_CACHE_TTL are dropped and refetched."""
+    upstream = AsyncMock(side_effect=refined)
+
+    with patch.object(service, "_refine_with_retries", upstream):
+        await service.refine_statement_async(refinement_request)
+        key, (cached_at, response) = next(iter(_REFINEMENT_CACHE.items()))
+        _REFINEMENT_CACHE[key] = (cached_at - REFINEMENT_CACHE_TTL, response)
+        await service.refine_statement_async(refinement_request)
+
+    assert upstream.await_count == 2
+    assert _REFINEMENT_CACHE[key][0] > cached_at - REFINEMENT_CACHE_TTL
+
+
+@pytest.mark.asyncio
+async def test_refinement_cache_evicts_least_recent(service, refinement_request):
+    """The cache holds REFINEMENT_CACHE_SIZE entries, evicting the oldest use."""
+    requests = [
+        refinement_request.model_copy(update={"citation_number": f"91234567{i}"})
+        for i in range(3)
+    ]
+    upstream = AsyncMock(side_effect=refined)
+
+    with patch("src.services.statement.REFINEMENT_CACHE_SIZE", 2), \
+         patch.object(service, "_refine_with_retries", upstream):
+        await service.refine_statement_async(requests[0])
+        await service.refine_statement_async(requests[1])
+        await service.refine_statement_async(requests[0])  # now most recent
+        await service.refine_statement_async(requests[2])  # evicts requests[1]
+        await service.refine_statement_async(requests[0])
+        await service.refine_statement_async(requests[1])
+
+    assert len(_REFINEMENT_CACHE) == 2
+    assert [call.args[0] for call in upstream.await_args_list] == [
+        requests[0], requests[1], requests[2], requests[1]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fallback_refinements_are_not_cached(service, refinement_request):
+    """A local fallback is never stored, so the next request retries DeepSeek."""
+    upstream = AsyncMock(side_effect=lambda request: refined(request, status="fallback"))
+
+    with patch.object(service, "_refine_with_retries", upstream):
+        await service.refine_statement_async(refinement_request)
+        await service.refine_statement_async(refinement_request)
+
+    assert upstream.await_count == 2
+    assert not _REFINEMENT_CACHE
@@ -0,0 +1,71 @@
+import datetime
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import boto3
+import botocore.auth
+import pytest
+from botocore.config import Config
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.services.storage import StorageService
+
+FROZEN = datetime.datetime(2024, 1, 2, 3, 4, 5)
+REGION = "us-west-2"
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Pin botocore's signing clock so signatures are reproducible."""
+
+    class FrozenDatetime(datetime.datetime):
+        @classmethod
+        def utcnow(cls):
+            return FROZEN
+
+    # Older botocore reads datetime.utcnow(); newer get_current_datetime()
+    monkeypatch.setattr(botocore.auth, "datetime", SimpleNamespace(datetime=FrozenDatetime))
+    if hasattr(botocore.auth, "get_current_datetime"):
+        monkeypatch.setattr(botocore.auth, "get_current_datetime", lambda *args, **kwargs: FROZEN)
+
+
+@pytest.fixture
+def storage_service():
+    settings = MagicMock(
+        s3_bucket_name="appeal-photos",
+        aws_region=REGION,
+        aws_access_key_id="AKIDEXAMPLE",
+        aws_secret_access_key="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY",
+    )
+    with patch("src.services.storage.settings", settings):
+        yield StorageService()
+
+
+@pytest.mark.parametrize(
+    "key",
+    ["uploads/photo.jpg", "uploads/ticket #1 (front)+back~ü.jpg"],
+)
+def test_presigned_url_matches_botocore(frozen_clock, storage_service, key):
+    """The hand-signed PUT URL is byte-for-byte what botocore would produce."""
+    client = boto3.client(
+        "s3",
+        aws_access_key_id="AKIDEXAMPLE",
+        aws_secret_access_key="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY",
+        region_name=REGION,
+        endpoint_url=f"https://s3.{REGION}.amazonaws.com",
+        config=Config(signature_version="s3v4", s3={"addressing_style": "virtual"}),
+    )
+    expected = client.generate_presigned_url(
+        "put_object",
+        Params={"Bucket": "appeal-photos", "Key": key, "ContentType": "image/jpeg"},
+        ExpiresIn=900,
+    )
+
+    result = storage_service.generate_presigned_url(key, "image/jpeg", expiration=900)
+
+    assert result["upload_url"] == expected
+    assert result["key"] == key
@@ -1,9 +1,15 @@
 import asyncio
+import hashlib
+import hmac
 import time
 from unittest.mock import MagicMock, AsyncMock, patch
 import pytest
 import stripe
-from src.services.stripe_service import StripeService
+from src.services.stripe_service import (
+    StripeService,
+    _checkout_idempotency_key,
+    _signature_matches,
+)
 
 @pytest.fixture
 def stripe_service():
@@ -135,3 +141,96 @@ class TestStripeServiceRetry:
 
         assert mock_func.call_count == stripe_service.RETRY_COUNT
         assert mock_sleep.await_count == stripe_service.RETRY_COUNT - 1
+
+    @pytest.mark.parametrize(
+        ("attempt", "ceiling"), [(0, 1), (1, 2), (2, 4), (4, 16), (5, 30), (8, 30)]
+    )
+    def test_backoff_delay_doubles_up_to_max(self, stripe_service, attempt, ceiling):
+        """Backoff jitters below RETRY_DELAY * 2**attempt, capped at MAX_BACKOFF."""
+        with patch("src.services.stripe_service.random.uniform", side_effect=lambda lo, hi: hi):
+            assert stripe_service._backoff_delay(attempt) == ceiling
+
+
+class TestCheckoutIdempotencyKey:
+
+    def test_same_params_same_key(self):
+        """Retrying identical session params reuses the idempotency key."""
+        args = {"mode": "payment", "metadata": {"intake_id": "42"}}
+        assert _checkout_idempotency_key(args) == _checkout_idempotency_key(dict(args))
+
+    def test_key_scoped_to_intake(self):
+        """Key is prefixed with the intake it belongs to."""
+        key = _checkout_idempotency_key({"metadata": {"intake_id": "42"}})
+        assert key.startswith("checkout:42:")
+
+    def test_different_params_different_key(self):
+        """A changed checkout does not collide with the earlier session."""
+        a = {"metadata": {"intake_id": "42", "clerical_id": "A"}}
+        b = {"metadata": {"intake_id": "42", "clerical_id": "B"}}
+        assert _checkout_idempotency_key(a) != _checkout_idempotency_key(b)
+
+
+class TestValidateCheckoutRequest:
+
+    @pytest.mark.parametrize(
+        "state,zip_code,error",
+        [
+            ("ÉÉ", "94103", "State must be 2-letter code (e.g., CA)"),
+            ("C", "94103", "State must be 2-letter code (e.g., CA)"),
+            ("CA", "9410a", "ZIP code must be 5 digits"),
+            ("CA", "9410", "ZIP code must be 5 digits or 5+4 format"),
+        ],
+        ids=["non-ascii-state", "short-state", "bad-zip", "short-zip"],
+    )
+    def test_state_and_zip_errors(self, stripe_service, state, zip_code, error):
+        """The error names whichever half of the state/ZIP check failed."""
+        request = MagicMock(
+            user_name="Jane",
+            user_address_line1="1 Main St",
+            user_city="San Francisco",
+            user_state=state,
+            user_zip=zip_code,
+        )
+        with patch("src.services.stripe_service.CitationValidator") as validator:
+            validator.validate_citation.return_value = MagicMock(
+                is_valid=True, is_past_deadline=False
+            )
+            assert stripe_service.validate_checkout_request(request) == (False, error)
+
+
+class TestSessionStatuses:
+
+    @pytest.mark.asyncio
+    async def test_get_session_statuses_preserves_order(self, stripe_service):
+        """Batch lookup returns one status per ID, in request order."""
+        stripe_service.get_session_status = MagicMock(side_effect=lambda sid: f"status:{sid}")
+
+        result = await stripe_service.get_session_statuses(["cs_1", "cs_2", "cs_3"])
+
+        assert result == ["status:cs_1", "status:cs_2", "status:cs_3"]
+        assert stripe_service.get_session_status.call_count == 3
+
+
+class TestSignatureMatches:
+
+    SECRET = b"whsec_test"
+    PAYLOAD = b'{"id": "evt_sig"}'
+
+    def _header(self, timestamp: int, secret: bytes = SECRET) -> str:
+        signed = f"{timestamp}.".encode() + self.PAYLOAD
+        digest = hmac.new(secret, signed, hashlib.sha256).hexdigest()
+        return f"t={timestamp},v1={digest}"
+
+    def test_valid_signature(self):
+        assert _signature_matches(self.PAYLOAD, self._header(int(time.time())), self.SECRET)
+
+    def test_wrong_secret(self):
+        header = self._header(int(time.time()), secret=b"whsec_other")
+        assert not _signature_matches(self.PAYLOAD, header, self.SECRET)
+
+    def test_stale_timestamp(self):
+        header = self._header(int(time.time()) - 10_000)
+        assert not _signature_matches(self.PAYLOAD, header, self.SECRET)
+
+    def test_malformed_header(self):
+        assert not _signature_matches(self.PAYLOAD, "garbage", self.SECRET)
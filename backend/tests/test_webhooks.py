@@ -1,9 +1,10 @@
+import asyncio
 import pytest
 import sys
 import os
 import time
-from unittest.mock import MagicMock, patch, ANY
-from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch, ANY
+from datetime import datetime, timedelta, timezone
 
 # Add backend to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -17,6 +18,12 @@ from src.routes.webhooks import (
     _WEBHOOK_CACHE,
     _WEBHOOK_CACHE_TTL,
     _WEBHOOK_CACHE_MAX_SIZE,
+    _FULFILLMENT_TASKS,
+    _FULFILLMENTS_IN_PROGRESS,
+    drain_fulfillment_tasks,
+    handle_checkout_session_completed,
+    retry_fulfillment,
+    retry_pending_fulfillments,
 )
 from src.models import WebhookEvent
 
@@ -240,3 +247,127 @@ def test_memory_cache_cleanup_trigger(reset_webhook_cache):
 
         # evt_0 should be gone
         assert "evt_0" not in _WEBHOOK_CACHE
+
+
+@pytest.mark.asyncio
+async def test_redelivery_during_background_fulfillment(mock_db_service):
+    """A redelivered event does not mail again while fulfillment is running."""
+    mock_db_service.get_payment_by_session.return_value = None
+    _FULFILLMENTS_IN_PROGRESS.add("cs_in_flight")
+    try:
+        result = await handle_checkout_session_completed(
+            {"id": "cs_in_flight", "payment_status": "paid", "metadata": {}}
+        )
+    finally:
+        _FULFILLMENTS_IN_PROGRESS.discard("cs_in_flight")
+
+    assert result["processed"] is True
+    assert "in progress" in result["message"]
+    mock_db_service.advance_payment_state.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_delivery_claimed_in_redis(mock_db_service):
+    """A delivery already claimed in Redis returns without touching the DB."""
+    redis_mock = MagicMock()
+    redis_mock.set = AsyncMock(return_value=None)  # SET NX lost the race
+    with patch("src.routes.webhooks._get_redis_client", return_value=redis_mock):
+        result = await handle_checkout_session_completed(
+            {"id": "cs_dup", "payment_status": "paid", "metadata": {}}
+        )
+
+    assert result["processed"] is True
+    assert "Duplicate" in result["message"]
+    mock_db_service.get_payment_by_session.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unfinished_event_releases_redis_claim(mock_db_service):
+    """A claimed event that stops early drops its claim so a retry can run."""
+    redis_mock = MagicMock()
+    redis_mock.set = AsyncMock(return_value=True)
+    redis_mock.delete = AsyncMock()
+    mock_db_service.get_payment_by_session.return_value = MagicMock(
+        status=MagicMock(value="pending"), intake_id=7
+    )
+    mock_db_service.get_intake.return_value = None
+    with patch("src.routes.webhooks._get_redis_client", return_value=redis_mock), \
+         patch("src.routes.webhooks._is_event_processed", return_value=(False, None)):
+        result = await handle_checkout_session_completed(
+            {"id": "cs_no_intake", "payment_status": "paid", "metadata": {}}
+        )
+
+    assert result["processed"] is False
+    redis_mock.delete.assert_awaited_once_with(
+        "stripe:webhook:checkout.session.completed:cs_no_intake"
+    )
+
+
+@pytest.mark.asyncio
+async def test_drain_fulfillment_tasks_waits_for_mailings():
+    """Shutdown waits for queued mailings instead of cancelling them."""
+    finished = []
+
+    async def mailing():
+        await asyncio.sleep(0.01)
+        finished.append(True)
+
+    task = asyncio.create_task(mailing())
+    _FULFILLMENT_TASKS.add(task)
+    task.add_done_callback(_FULFILLMENT_TASKS.discard)
+
+    await drain_fulfillment_tasks(timeout=1)
+
+    assert finished == [True]
+    assert not _FULFILLMENT_TASKS
+
+
+@pytest.mark.asyncio
+async def test_retry_pending_fulfillments_skips_recent_payments(mock_db_service):
+    """Only payments paid before the grace window are re-mailed."""
+    now = datetime.now(timezone.utc)
+    orphaned = MagicMock(stripe_session_id="cs_orphaned", paid_at=now - timedelta(hours=1))
+    recent = MagicMock(stripe_session_id="cs_recent", paid_at=now)
+    mock_db_service.get_pending_payments.return_value = [orphaned, recent]
+
+    fulfill = AsyncMock(return_value={"success": True, "message": "", "fulfillment_result": None})
+    with patch("src.routes.webhooks._fulfill_claimed", fulfill), \
+         patch("src.routes.webhooks._build_mail_request"):
+        fulfilled = await retry_pending_fulfillments(grace_seconds=600)
+
+    assert fulfilled == 1
+    assert fulfill.await_args.args[1] == "cs_orphaned"
+    _FULFILLMENTS_IN_PROGRESS.discard("cs_orphaned")
+
+
+@pytest.mark.asyncio
+async def test_failed_background_mailing_can_be_retried(mock_db_service, reset_webhook_cache):
+    """A queued mailing that fails is not cached as done for the admin retry."""
+    # No webhook_events table: results land in the in-memory cache
+    mock_db_service.db.query.side_effect = Exception("no such table")
+    mock_db_service.db.add.side_effect = Exception("no such table")
+    mock_db_service.get_payment_by_session.return_value = MagicMock(
+        status=MagicMock(value="pending"), intake_id=7
+    )
+    session = {"id": "cs_mail_fails", "payment_status": "paid", "metadata": {}}
+    mail_service = MagicMock()
+    mail_service.send_appeal_letter = AsyncMock(
+        return_value=MagicMock(success=False, error_message="Lob unavailable")
+    )
+    stripe_service = MagicMock()
+    stripe_service.stripe.checkout.Session.retrieve.return_value = session
+    request = MagicMock()
+    request.json = AsyncMock(return_value={"session_id": "cs_mail_fails"})
+
+    with patch("src.routes.webhooks._get_redis_client", return_value=None), \
+         patch("src.routes.webhooks._build_mail_request"), \
+         patch("src.routes.webhooks.get_mail_service", return_value=mail_service), \
+         patch("src.routes.webhooks.StripeService", return_value=stripe_service), \
+         patch("src.routes.webhooks.verify_admin_secret"):
+        queued = await handle_checkout_session_completed(session)
+        await drain_fulfillment_tasks(timeout=1)
+        retried = await retry_fulfillment.__wrapped__(request, admin_secret="secret")
+
+    assert queued["message"] == "Payment processed; appeal mailing queued"
+    assert retried["success"] is False
+    assert mail_service.send_appeal_letter.await_count == 2